@@ -0,0 +1,234 @@
+#!/usr/bin/env -S uv run --script
+"""Benchmark prp_runner's output handling against the stub model.
+
+Runs prp_runner with stub_model.py as --model for each scenario and output
+format and measures, per run:
+    wall      time from spawning the runner to its exit
+    first     time from spawning the runner to the first byte of its stdout
+    MiB/s     runner stdout bytes forwarded per second of wall time
+    msgs/s    stub messages handled per second of wall time
+    peak RSS  maximum resident set size of the runner process itself
+
+The runner is started through a small launcher that reports its
+getrusage(RUSAGE_SELF) peak on exit. RUSAGE_SELF excludes children, so the
+stub's memory is not counted (rusage from os.wait4 would include it).
+
+Typical usage:
+    uv run PRPs/scripts/bench/bench.py
+    uv run PRPs/scripts/bench/bench.py --scenario large-payloads --format stream-json
+    uv run PRPs/scripts/bench/bench.py --save baseline.json
+    uv run PRPs/scripts/bench/bench.py --compare baseline.json --tolerance 0.2
+
+Arguments:
+    --scenario   Scenario to run, repeatable (default: all)
+    --format     Output format to run, repeatable (default: all)
+    --repeat     Runs per scenario and format; the median is reported (default: 3)
+    --save       Write the results as JSON for a later --compare
+    --compare    Compare against saved results; exit 1 if wall time or peak
+                 RSS grew by more than --tolerance (default: 0.25)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+RUNNER = BENCH_DIR.parent / "prp_runner.py"
+STUB = BENCH_DIR / "stub_model.py"
+
+# runs the script in argv[1] and writes its own peak RSS (KiB) to the fd in
+# PRP_BENCH_RSS_FD at exit
+LAUNCHER = """\
+import atexit, os, resource, runpy, sys
+fd = int(os.environ["PRP_BENCH_RSS_FD"])
+atexit.register(
+    lambda: os.write(
+        fd, str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss).encode()
+    )
+)
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+FORMATS = ["text", "json", "stream-json"]
+
+# environment for stub_model.py per scenario
+SCENARIOS: Dict[str, Dict[str, str]] = {
+    "many-small": {"PRP_STUB_MESSAGES": "20000", "PRP_STUB_PAYLOAD_BYTES": "200"},
+    "large-payloads": {
+        "PRP_STUB_MESSAGES": "64",
+        "PRP_STUB_PAYLOAD_BYTES": str(1 << 20),
+    },
+    "bursty-stderr": {
+        "PRP_STUB_MESSAGES": "2000",
+        "PRP_STUB_PAYLOAD_BYTES": "1024",
+        "PRP_STUB_STDERR_BYTES": str(256 << 10),
+        "PRP_STUB_STDERR_EVERY": "100",
+    },
+    "slow-producer": {
+        "PRP_STUB_MESSAGES": "200",
+        "PRP_STUB_PAYLOAD_BYTES": "1024",
+        "PRP_STUB_DELAY": "0.005",
+    },
+}
+
+
+def run_once(prp_path: Path, output_format: str, scenario: str) -> Dict[str, float]:
+    """Run the runner once and measure it."""
+    cmd = [
+        sys.executable,
+        "-c",
+        LAUNCHER,
+        str(RUNNER),
+        "--prp-path",
+        str(prp_path),
+        "--model",
+        str(STUB),
+        "--output-format",
+        output_format,
+        "--no-ledger",
+    ]
+    rss_read, rss_write = os.pipe()
+    env = dict(os.environ, PRP_BENCH_RSS_FD=str(rss_write), **SCENARIOS[scenario])
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        pass_fds=(rss_write,),
+    )
+    os.close(rss_write)
+    first_byte = None
+    total = 0
+    fd = process.stdout.fileno()
+    while chunk := os.read(fd, 1 << 16):
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        total += len(chunk)
+    process.wait()
+    wall = time.perf_counter() - started
+    process.stdout.close()
+    with os.fdopen(rss_read) as rss:
+        peak_rss_kib = int(rss.read() or 0)
+    if process.returncode != 0:
+        sys.exit(f"{scenario}/{output_format}: runner exited with {process.returncode}")
+    messages = int(SCENARIOS[scenario]["PRP_STUB_MESSAGES"])
+    return {
+        "wall_s": wall,
+        "first_event_s": first_byte if first_byte is not None else wall,
+        "mib_per_s": total / wall / (1 << 20),
+        "msgs_per_s": messages / wall,
+        "peak_rss_mib": peak_rss_kib / 1024,  # KiB on Linux
+    }
+
+
+def run_benchmark(
+    scenarios: List[str], formats: List[str], repeat: int
+) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        prp_path = Path(tmp) / "bench.md"
+        prp_path.write_text("# Benchmark PRP\n\nThe stub model ignores this.\n")
+        for scenario in scenarios:
+            for output_format in formats:
+                runs = [
+                    run_once(prp_path, output_format, scenario) for _ in range(repeat)
+                ]
+                row: Dict[str, Any] = {"scenario": scenario, "format": output_format}
+                for metric in runs[0]:
+                    values = [run[metric] for run in runs]
+                    row[metric] = (
+                        max(values)
+                        if metric == "peak_rss_mib"
+                        else statistics.median(values)
+                    )
+                results.append(row)
+                print_row(row)
+    return results
+
+
+def print_header() -> None:
+    print(
+        f"{'scenario':<16}{'format':<13}{'wall':>9}{'first':>9}"
+        f"{'MiB/s':>9}{'msgs/s':>10}{'peak RSS':>12}"
+    )
+
+
+def print_row(row: Dict[str, Any]) -> None:
+    print(
+        f"{row['scenario']:<16}{row['format']:<13}"
+        f"{row['wall_s']:>8.3f}s{row['first_event_s']:>8.3f}s"
+        f"{row['mib_per_s']:>9.1f}{row['msgs_per_s']:>10.0f}"
+        f"{row['peak_rss_mib']:>8.1f} MiB"
+    )
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline_path: Path, tolerance: float
+) -> bool:
+    """Print changes against a saved run; True if nothing regressed."""
+    baseline = {
+        (row["scenario"], row["format"]): row
+        for row in json.loads(baseline_path.read_text())
+    }
+    ok = True
+    print(f"\nAgainst {baseline_path} (tolerance {tolerance:.0%}):")
+    for row in results:
+        before = baseline.get((row["scenario"], row["format"]))
+        if before is None:
+            continue
+        changes = []
+        for metric in ("wall_s", "first_event_s", "peak_rss_mib"):
+            ratio = row[metric] / before[metric] if before[metric] else 1.0
+            regressed = metric != "first_event_s" and ratio > 1 + tolerance
+            ok = ok and not regressed
+            changes.append(
+                f"{metric} {ratio:.2f}x" + (" REGRESSED" if regressed else "")
+            )
+        print(f"  {row['scenario']:<16}{row['format']:<13}{'  '.join(changes)}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark prp_runner output.")
+    parser.add_argument(
+        "--scenario", action="append", choices=list(SCENARIOS), help="(default: all)"
+    )
+    parser.add_argument(
+        "--format", action="append", choices=FORMATS, help="(default: all)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare with results saved by --save")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative growth in wall time and peak RSS (default: 0.25)",
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        sys.exit("--repeat must be at least 1")
+
+    print_header()
+    results = run_benchmark(
+        args.scenario or list(SCENARIOS), args.format or FORMATS, args.repeat
+    )
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2) + "\n")
+    if args.compare and not compare(results, Path(args.compare), args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
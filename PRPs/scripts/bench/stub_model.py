@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Stand-in for the model CLI that emits a configurable volume of output.
+
+Accepts the arguments prp_runner passes to the real CLI (-p, --allowedTools,
+--output-format) and ignores the prompt. The output is shaped by
+environment variables so the runner's command line stays unchanged:
+
+    PRP_STUB_MESSAGES        assistant messages to emit (default: 100)
+    PRP_STUB_PAYLOAD_BYTES   text bytes per assistant message (default: 1024)
+    PRP_STUB_DELAY           seconds to sleep before each message (default: 0)
+    PRP_STUB_STDERR_BYTES    bytes written to stderr per burst (default: 0)
+    PRP_STUB_STDERR_EVERY    messages between stderr bursts (default: 10)
+    PRP_STUB_EXIT_CODE       exit code (default: 0)
+
+Usage:
+    PRP_STUB_MESSAGES=5000 uv run PRPs/scripts/prp_runner.py \\
+        --prp-path PRPs/feature.md --model PRPs/scripts/bench/stub_model.py \\
+        --output-format stream-json --no-ledger
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+SESSION_ID = "00000000-0000-4000-8000-000000000000"
+
+
+def env_number(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub model CLI for benchmarks.")
+    parser.add_argument("-p", "--print", dest="prompt")
+    parser.add_argument("--output-format", default="text")
+    args, _ = parser.parse_known_args()
+
+    messages = int(env_number("PRP_STUB_MESSAGES", 100))
+    payload_bytes = int(env_number("PRP_STUB_PAYLOAD_BYTES", 1024))
+    delay = env_number("PRP_STUB_DELAY", 0)
+    stderr_bytes = int(env_number("PRP_STUB_STDERR_BYTES", 0))
+    stderr_every = max(1, int(env_number("PRP_STUB_STDERR_EVERY", 10)))
+
+    text = ('lorem ipsum "quoted" \\ path\n' * (payload_bytes // 28 + 1))[
+        :payload_bytes
+    ]
+    # serialise once; every assistant line is the same bytes
+    assistant = (
+        json.dumps(
+            {
+                "type": "assistant",
+                "message": {
+                    "id": "msg_stub",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": "stub",
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": None,
+                },
+                "session_id": SESSION_ID,
+            }
+        ).encode()
+        + b"\n"
+    )
+    noise = (b"stub: progress noise on stderr\n" * (stderr_bytes // 31 + 1))[
+        :stderr_bytes
+    ]
+    result = {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "cost_usd": 0.0,
+        "duration_ms": 0,
+        "num_turns": messages,
+        "result": "DONE",
+        "session_id": SESSION_ID,
+    }
+    out = sys.stdout.buffer
+    started = time.monotonic()
+
+    if args.output_format == "stream-json":
+        out.write(
+            json.dumps(
+                {"type": "system", "subtype": "init", "session_id": SESSION_ID}
+            ).encode()
+            + b"\n"
+        )
+        out.flush()
+
+    for i in range(messages):
+        if delay:
+            time.sleep(delay)
+        if noise and i % stderr_every == 0:
+            sys.stderr.buffer.write(noise)
+            sys.stderr.buffer.flush()
+        if args.output_format == "stream-json":
+            out.write(assistant)
+            out.flush()
+        elif args.output_format == "text":
+            out.write(text.encode() + b"\n")
+
+    result["duration_ms"] = round((time.monotonic() - started) * 1000)
+    if args.output_format == "json":
+        # one object at the end, with the whole conversation's text
+        result["result"] = text * messages
+        out.write(json.dumps(result).encode())
+    elif args.output_format == "stream-json":
+        out.write(json.dumps(result).encode() + b"\n")
+    else:
+        out.write(b"DONE\n")
+    out.flush()
+    sys.exit(int(env_number("PRP_STUB_EXIT_CODE", 0)))
+
+
+if __name__ == "__main__":
+    main()
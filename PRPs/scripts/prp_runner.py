@@ -7,6 +7,7 @@ Typical usage:
     uv run RUNNERS/claude_runner.py --prp test --interactive
     uv run RUNNERS/claude_runner.py --prp test --output-format json
     uv run RUNNERS/claude_runner.py --prp test --output-format stream-json
+    uv run RUNNERS/claude_runner.py --batch "PRPs/02*.md" --jobs 3
 
 Arguments:
     --prp-path       Path to a PRP markdown file (overrides --prp)
@@ -14,20 +15,111 @@ Arguments:
     --model          CLI executable for the LLM (default: "claude") Only Claude Code is supported for now
     --interactive    Pass through to run the model in chat mode; otherwise headless.
     --output-format  Output format for headless mode: text, json, stream-json (default: text)
+    --batch          PRP paths or globs (relative to the cwd or the repository root) to run
+                     in parallel, each in its own git worktree
+    --jobs           Maximum number of PRPs running at once in batch mode (default: 4)
+    --log-dir        Directory for per-PRP batch logs (default: PRPs/logs/<timestamp>)
+    --clean          Recreate worktrees and prp/ branches left by an earlier batch
+    --ledger         SQLite ledger headless runs are recorded in (default: PRPs/runs.sqlite3)
+    --no-ledger      Do not record the run
+
+Stats:
+    uv run RUNNERS/claude_runner.py stats [--since DAYS] [--top N]
+
+    Reports run totals, wall time/cost/turn percentiles, the slowest and most
+    expensive PRPs, and PRPs whose latest run took 1.5x the median wall time
+    or cost of their earlier runs.
+
+Batch mode:
+    A PRP declares what it builds on with a line such as
+
+        Depends-On: 011-fix-namespace-leaks, 013
+
+    naming other PRPs by file stem or by number. A PRP starts once everything
+    it depends on has succeeded, in a worktree at ../<project>-prp-<stem> on
+    branch prp/<stem> created from its dependencies' branches (or HEAD). The
+    worktree's changes are committed to that branch when the run succeeds.
+    PRPs that depend on a failed PRP are skipped; dependencies outside the
+    batch are assumed to be done already.
+
+    Worktrees and branches are left in place after the batch, so results and
+    failed runs can be inspected; only a worktree whose dependency merge
+    conflicts is removed straight away. A PRP whose worktree or branch is
+    still there fails on the next batch unless --clean is given, which
+    removes both and starts the PRP afresh. To clean up by hand:
+
+        git worktree remove --force ../<project>-prp-<stem>
+        git branch -D prp/<stem>
 """
 
 from __future__ import annotations
 
 import argparse
+import glob
+import hashlib
 import json
+import math
 import os
+import re
+import selectors
+import sqlite3
+import statistics
 import subprocess
 import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterator
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 ROOT = Path(__file__).resolve().parent.parent  # project root
 
+DEPENDS_ON = re.compile(r"^\s*depends-on:\s*(.*)$", re.IGNORECASE | re.MULTILINE)
+
+# stream-json: the top-level "type" leads each line, so it is found by a
+# bounded scan; only system and result lines are parsed in full.
+TYPE_FIELD = re.compile(rb'"type"\s*:\s*"(\w+)"')
+TYPE_SCAN_BYTES = 256
+TEXT_PREVIEW = re.compile(rb'"text"\s*:\s*"((?:[^"\\]|\\.){0,100})')
+READ_SIZE = 1 << 16
+STDERR_TAIL_LINES = 200
+
+DEFAULT_LEDGER = ROOT / "runs.sqlite3"
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    prp_path TEXT NOT NULL,
+    prp_stem TEXT NOT NULL,
+    prp_sha256 TEXT NOT NULL,
+    model TEXT NOT NULL,
+    output_format TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    wall_ms INTEGER NOT NULL,
+    exit_code INTEGER NOT NULL,
+    is_error INTEGER,
+    cost_usd REAL,
+    duration_ms INTEGER,
+    num_turns INTEGER,
+    session_id TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_prp ON runs (prp_stem, started_at);
+"""
+REGRESSION_MIN_RUNS = 3
+REGRESSION_RATIO = 1.5
+
 META_HEADER = """Ingest and understand the Product Requirement Prompt (PRP) below in detail.
 
     # WORKFLOW GUIDANCE:
@@ -68,16 +160,128 @@ def build_prompt(prp_path: Path) -> str:
     return META_HEADER + prp_path.read_text()
 
 
-def stream_json_output(process: subprocess.Popen) -> Iterator[Dict[str, Any]]:
-    """Parse streaming JSON output line by line."""
-    for line in process.stdout:
-        line = line.strip()
-        if line:
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError as e:
-                print(f"Warning: Failed to parse JSON line: {e}", file=sys.stderr)
-                print(f"Line content: {line}", file=sys.stderr)
+def multiplex_lines(process: subprocess.Popen) -> Iterator[Tuple[int, List[bytes]]]:
+    """Yield (fd, lines) from the process's stdout and stderr as data arrives.
+
+    Both pipes are drained together, so a child writing heavily to stderr
+    cannot fill that pipe and stall while we wait on stdout. Lines are raw
+    bytes with their newline; an unterminated last line is yielded at EOF.
+    """
+    selector = selectors.DefaultSelector()
+    partial: Dict[int, List[bytes]] = {}
+    for pipe in (process.stdout, process.stderr):
+        selector.register(pipe.fileno(), selectors.EVENT_READ)
+        partial[pipe.fileno()] = []
+    try:
+        while selector.get_map():
+            for key, _ in selector.select():
+                fd = key.fd
+                chunk = os.read(fd, READ_SIZE)
+                if not chunk:
+                    selector.unregister(fd)
+                    if partial[fd]:
+                        yield fd, [b"".join(partial[fd])]
+                    continue
+                end = chunk.find(b"\n")
+                if end < 0:
+                    partial[fd].append(chunk)  # joined once the line completes
+                    continue
+                lines = [b"".join(partial[fd]) + chunk[: end + 1]]
+                start = end + 1
+                while (end := chunk.find(b"\n", start)) >= 0:
+                    lines.append(chunk[start : end + 1])
+                    start = end + 1
+                partial[fd] = [chunk[start:]] if start < len(chunk) else []
+                yield fd, lines
+    finally:
+        selector.close()
+
+
+def message_type(line: bytes) -> Optional[str]:
+    """Read a stream-json line's top-level type without parsing the line."""
+    match = TYPE_FIELD.search(line, 0, TYPE_SCAN_BYTES)
+    return match.group(1).decode() if match else None
+
+
+def parse_message(line: bytes) -> Dict[str, Any]:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        print(f"Warning: Failed to parse JSON line: {e}", file=sys.stderr)
+        return {}
+
+
+def report_message(kind: str, line: bytes) -> Dict[str, Any]:
+    """Print the progress summary for one stream-json message to stderr.
+
+    Returns the parsed message for the kinds that are parsed, else {}.
+    """
+    message: Dict[str, Any] = {}
+    if kind == "system":
+        message = parse_message(line)
+        if message.get("subtype") == "init":
+            print(f"Session started: {message.get('session_id')}", file=sys.stderr)
+    elif kind == "assistant":
+        # assistant messages carry the bulk of the stream; preview without parsing
+        match = TEXT_PREVIEW.search(line)
+        preview = match.group(1).decode(errors="replace") if match else ""
+        print(f"Assistant: {preview}...", file=sys.stderr)
+    elif kind == "result":
+        message = parse_message(line)
+        print(f"\nFinal result:", file=sys.stderr)
+        print(f"  Success: {message.get('subtype') == 'success'}", file=sys.stderr)
+        print(f"  Cost: ${message.get('cost_usd', 0):.4f}", file=sys.stderr)
+        print(f"  Duration: {message.get('duration_ms', 0)}ms", file=sys.stderr)
+        print(f"  Turns: {message.get('num_turns', 0)}", file=sys.stderr)
+        if message.get("result"):
+            print(f"\nResult text:\n{message.get('result')}", file=sys.stderr)
+    return message
+
+
+def run_stream_json(cmd: List[str], sink: BinaryIO, result: Dict[str, Any]) -> None:
+    """Run the model, forwarding its stream-json lines to sink unchanged.
+
+    The result message is copied into result, even if the run then fails.
+    """
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout_fd = process.stdout.fileno()
+    stderr_tail: Deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+
+    try:
+        for fd, lines in multiplex_lines(process):
+            if fd != stdout_fd:
+                stderr_tail.extend(lines)
+                continue
+            for line in lines:
+                if not line.strip():
+                    continue
+                kind = message_type(line)
+                if kind is None:
+                    print(
+                        "Warning: Skipping line without a message type", file=sys.stderr
+                    )
+                    print(f"Line content: {line[:200]!r}", file=sys.stderr)
+                    continue
+                message = report_message(kind, line)
+                if kind == "result":
+                    result.update(message)
+                sink.write(line if line.endswith(b"\n") else line + b"\n")
+            sink.flush()
+
+        process.wait()
+        if process.returncode != 0:
+            print(
+                f"Claude Code failed with exit code {process.returncode}",
+                file=sys.stderr,
+            )
+            stderr = b"".join(stderr_tail).decode(errors="replace")
+            print(f"Error: {stderr}", file=sys.stderr)
+            sys.exit(process.returncode)
+
+    except KeyboardInterrupt:
+        process.terminate()
+        print("\nInterrupted by user", file=sys.stderr)
+        sys.exit(1)
 
 
 def handle_json_output(output: str) -> Dict[str, Any]:
@@ -94,7 +298,10 @@ def run_model(
     model: str = "claude",
     interactive: bool = False,
     output_format: str = "text",
+    summary: Optional[Dict[str, Any]] = None,
 ) -> None:
+    """Run the model on prompt; the result message, if any, goes into summary."""
+    summary = {} if summary is None else summary
     if interactive:
         # Chat mode: feed prompt via STDIN, no -p flag so the user can continue the session.
         cmd = [
@@ -118,72 +325,8 @@ def run_model(
         ]
 
         if output_format == "stream-json":
-            # Handle streaming JSON output
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # Line buffered
-            )
-
-            try:
-                for message in stream_json_output(process):
-                    # Process each message as it arrives
-                    if (
-                        message.get("type") == "system"
-                        and message.get("subtype") == "init"
-                    ):
-                        print(
-                            f"Session started: {message.get('session_id')}",
-                            file=sys.stderr,
-                        )
-                    elif message.get("type") == "assistant":
-                        print(
-                            f"Assistant: {message.get('message', {}).get('content', '')[:100]}...",
-                            file=sys.stderr,
-                        )
-                    elif message.get("type") == "result":
-                        print(f"\nFinal result:", file=sys.stderr)
-                        print(
-                            f"  Success: {message.get('subtype') == 'success'}",
-                            file=sys.stderr,
-                        )
-                        print(
-                            f"  Cost: ${message.get('cost_usd', 0):.4f}",
-                            file=sys.stderr,
-                        )
-                        print(
-                            f"  Duration: {message.get('duration_ms', 0)}ms",
-                            file=sys.stderr,
-                        )
-                        print(
-                            f"  Turns: {message.get('num_turns', 0)}", file=sys.stderr
-                        )
-                        if message.get("result"):
-                            print(
-                                f"\nResult text:\n{message.get('result')}",
-                                file=sys.stderr,
-                            )
-
-                    # Print the full message for downstream processing
-                    print(json.dumps(message))
-
-                # Wait for process to complete
-                process.wait()
-                if process.returncode != 0:
-                    stderr = process.stderr.read()
-                    print(
-                        f"Claude Code failed with exit code {process.returncode}",
-                        file=sys.stderr,
-                    )
-                    print(f"Error: {stderr}", file=sys.stderr)
-                    sys.exit(process.returncode)
-
-            except KeyboardInterrupt:
-                process.terminate()
-                print("\nInterrupted by user", file=sys.stderr)
-                sys.exit(1)
+            # Forward each message for downstream processing as it arrives
+            run_stream_json(cmd, sys.stdout.buffer, summary)
 
         elif output_format == "json":
             # Handle complete JSON output
@@ -203,6 +346,7 @@ def run_model(
             # Print summary to stderr for user visibility
             if isinstance(json_data, dict):
                 if json_data.get("type") == "result":
+                    summary.update(json_data)
                     print(f"\nSummary:", file=sys.stderr)
                     print(
                         f"  Success: {not json_data.get('is_error', False)}",
@@ -225,8 +369,454 @@ def run_model(
             subprocess.run(cmd, check=True)
 
 
+def open_ledger(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)  # batch runs write concurrently
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(LEDGER_SCHEMA)
+    return conn
+
+
+def record_run(
+    ledger: Path,
+    prp_path: Path,
+    prp_sha256: str,
+    model: str,
+    output_format: str,
+    started_at: datetime,
+    wall_seconds: float,
+    exit_code: int,
+    result: Dict[str, Any],
+) -> None:
+    """Append one run and its result message fields to the ledger.
+
+    prp_sha256 is taken before the run: the agent may move the PRP to
+    PRPs/completed when it finishes.
+    """
+    try:
+        shown_path = str(prp_path.relative_to(ROOT.parent))
+    except ValueError:
+        shown_path = str(prp_path)
+    cost = result.get("total_cost_usd", result.get("cost_usd"))
+    is_error = result.get("is_error", result.get("subtype", "success") != "success")
+    try:
+        with closing(open_ledger(ledger)) as conn, conn:
+            conn.execute(
+                "INSERT INTO runs (prp_path, prp_stem, prp_sha256, model, output_format,"
+                " started_at, wall_ms, exit_code, is_error, cost_usd, duration_ms,"
+                " num_turns, session_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    shown_path,
+                    prp_path.stem,
+                    prp_sha256,
+                    model,
+                    output_format,
+                    started_at.isoformat(timespec="seconds"),
+                    round(wall_seconds * 1000),
+                    exit_code,
+                    int(is_error) if result else None,
+                    cost,
+                    result.get("duration_ms"),
+                    result.get("num_turns"),
+                    result.get("session_id"),
+                ),
+            )
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warning: Failed to record run in {ledger}: {e}", file=sys.stderr)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+def format_percentiles(values: List[float], fmt: Callable[[float], str]) -> str:
+    if not values:
+        return "-"
+    return "  ".join(f"p{p} {fmt(percentile(values, p)):>8}" for p in (50, 90, 99))
+
+
+def format_cost(cost: float) -> str:
+    return f"${cost:.4f}"
+
+
+def print_stats(ledger: Path, since_days: Optional[float], top: int) -> None:
+    """Report run totals, percentiles, and the slowest, costliest and
+    regressing PRPs from the ledger."""
+    if not ledger.exists():
+        sys.exit(f"No ledger at {ledger}")
+    query = (
+        "SELECT prp_stem, started_at, wall_ms, exit_code, cost_usd, num_turns"
+        " FROM runs"
+    )
+    params: Tuple[Any, ...] = ()
+    if since_days is not None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=since_days)
+        query += " WHERE started_at >= ?"
+        params = (cutoff.isoformat(timespec="seconds"),)
+    with closing(open_ledger(ledger)) as conn:
+        rows = conn.execute(query + " ORDER BY started_at, id", params).fetchall()
+    if not rows:
+        print("No runs recorded")
+        return
+
+    walls = [row[2] / 1000 for row in rows]
+    costs = [row[4] for row in rows if row[4] is not None]
+    turns = [row[5] for row in rows if row[5] is not None]
+    failed = sum(row[3] != 0 for row in rows)
+    print(f"Runs: {len(rows)} ({len(rows) - failed} succeeded, {failed} failed)")
+    print(f"  since {rows[0][1]}")
+    print(f"Total cost: {format_cost(sum(costs))}")
+    print(f"Total time: {format_elapsed(sum(walls))}")
+    print(f"Wall time  {format_percentiles(walls, format_elapsed)}")
+    print(f"Cost       {format_percentiles(costs, format_cost)}")
+    print(f"Turns      {format_percentiles(turns, lambda n: str(int(n)))}")
+
+    by_prp: Dict[str, List[Tuple[Any, ...]]] = {}
+    for row in rows:
+        by_prp.setdefault(row[0], []).append(row)
+    width = max(len(stem) for stem in by_prp)
+
+    print("\nSlowest PRPs (median wall time):")
+    slowest = sorted(
+        by_prp.items(),
+        key=lambda item: statistics.median(r[2] for r in item[1]),
+        reverse=True,
+    )
+    for stem, runs in slowest[:top]:
+        run_walls = [r[2] / 1000 for r in runs]
+        print(
+            f"  {stem:<{width}}  runs {len(runs):>3}  "
+            f"{format_percentiles(run_walls, format_elapsed)}"
+        )
+
+    print("\nMost expensive PRPs (total cost):")
+    priced = {
+        stem: [r[4] for r in runs if r[4] is not None] for stem, runs in by_prp.items()
+    }
+    for stem, run_costs in sorted(priced.items(), key=lambda i: -sum(i[1]))[:top]:
+        if run_costs:
+            print(
+                f"  {stem:<{width}}  runs {len(run_costs):>3}  "
+                f"total {format_cost(sum(run_costs)):>9}  "
+                f"mean {format_cost(statistics.mean(run_costs))}"
+            )
+
+    regressions = []
+    for stem, runs in by_prp.items():
+        if len(runs) < REGRESSION_MIN_RUNS:
+            continue
+        *earlier, latest = runs
+        wall_ratio = latest[2] / max(1, statistics.median(r[2] for r in earlier))
+        earlier_costs = [r[4] for r in earlier if r[4] is not None]
+        cost_ratio = (
+            latest[4] / statistics.median(earlier_costs)
+            if latest[4] is not None
+            and earlier_costs
+            and statistics.median(earlier_costs)
+            else 0.0
+        )
+        if max(wall_ratio, cost_ratio) >= REGRESSION_RATIO:
+            regressions.append(
+                (max(wall_ratio, cost_ratio), stem, wall_ratio, cost_ratio)
+            )
+    print(
+        f"\nRegressions (latest run >= {REGRESSION_RATIO}x the median of earlier runs):"
+    )
+    if not regressions:
+        print("  none")
+    for _, stem, wall_ratio, cost_ratio in sorted(regressions, reverse=True)[:top]:
+        print(
+            f"  {stem:<{width}}  wall {wall_ratio:.1f}x"
+            + (f"  cost {cost_ratio:.1f}x" if cost_ratio else "")
+        )
+
+
+@dataclass
+class BatchJob:
+    stem: str
+    prp_path: Path
+    depends_on: List[str] = field(default_factory=list)
+    status: str = "pending"  # pending, running, ok, failed, skipped
+    returncode: Optional[int] = None
+    worktree: Optional[Path] = None
+    log_path: Optional[Path] = None
+    started: float = 0.0
+    finished: float = 0.0
+    note: str = ""
+
+
+def parse_dependencies(prp_path: Path) -> List[str]:
+    """Return the PRP names listed on the PRP's Depends-On lines."""
+    names: List[str] = []
+    for match in DEPENDS_ON.finditer(prp_path.read_text()):
+        names.extend(name.strip("`*") for name in re.split(r"[,\s]+", match.group(1)))
+    return [name.removesuffix(".md") for name in names if name.strip("`*")]
+
+
+def resolve_batch(patterns: List[str]) -> List[Path]:
+    """Expand PRP paths and globs, relative to the cwd or the repository's top level."""
+    paths: Dict[Path, None] = {}
+    for pattern in patterns:
+        matches = glob.glob(pattern) or glob.glob(str(git_toplevel() / pattern))
+        if not matches:
+            sys.exit(f"No PRP matches: {pattern}")
+        for match in sorted(matches):
+            paths[Path(match).resolve()] = None
+    return list(paths)
+
+
+def plan_batch(prp_paths: List[Path]) -> List[BatchJob]:
+    """Build batch jobs with resolved dependencies, in dependency order."""
+    jobs: Dict[str, BatchJob] = {}
+    for prp_path in prp_paths:
+        if prp_path.stem in jobs:
+            sys.exit(f"Two PRPs named {prp_path.stem} in batch")
+        jobs[prp_path.stem] = BatchJob(stem=prp_path.stem, prp_path=prp_path)
+
+    for job in jobs.values():
+        for name in parse_dependencies(job.prp_path):
+            candidates = (
+                [name]
+                if name in jobs
+                else [s for s in jobs if s.startswith(f"{name}-")]
+            )
+            if len(candidates) > 1:
+                sys.exit(
+                    f"{job.stem}: Depends-On {name} is ambiguous: {', '.join(candidates)}"
+                )
+            if not candidates:
+                print(
+                    f"{job.stem}: {name} is not in this batch, assuming it is done",
+                    file=sys.stderr,
+                )
+            elif candidates[0] == job.stem:
+                sys.exit(f"{job.stem} depends on itself")
+            elif candidates[0] not in job.depends_on:
+                job.depends_on.append(candidates[0])
+
+    ordered: List[BatchJob] = []
+    placed: set = set()
+    remaining = list(jobs.values())
+    while remaining:
+        ready = [j for j in remaining if all(d in placed for d in j.depends_on)]
+        if not ready:
+            sys.exit(
+                f"Dependency cycle between: {', '.join(j.stem for j in remaining)}"
+            )
+        for job in ready:
+            ordered.append(job)
+            placed.add(job.stem)
+        remaining = [j for j in remaining if j.stem not in placed]
+    return ordered
+
+
+def git(*args: str, cwd: Path = ROOT) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        output = (
+            result.stderr or result.stdout
+        ).strip()  # merge conflicts go to stdout
+        raise RuntimeError(f"git {' '.join(args)} failed: {output}")
+    return result.stdout
+
+
+def git_toplevel() -> Path:
+    return Path(git("rev-parse", "--show-toplevel").strip())
+
+
+def worktree_path(stem: str) -> Path:
+    toplevel = git_toplevel()
+    return toplevel.parent / f"{toplevel.name}-prp-{stem}"
+
+
+def branch_exists(branch: str) -> bool:
+    result = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", f"refs/heads/{branch}"],
+        cwd=ROOT,
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+def remove_worktree(stem: str) -> None:
+    """Remove a PRP's worktree and its prp/<stem> branch, if they exist."""
+    path = worktree_path(stem)
+    if path.exists():
+        registered = f"worktree {path}\n" in git("worktree", "list", "--porcelain")
+        if not registered:
+            raise RuntimeError(f"{path} exists but is not a git worktree")
+        git("worktree", "remove", "--force", str(path))
+    git("worktree", "prune")
+    if branch_exists(f"prp/{stem}"):
+        git("branch", "-D", f"prp/{stem}")
+
+
+def create_worktree(job: BatchJob, clean: bool = False) -> Path:
+    """Create the job's worktree on top of its dependencies' branches.
+
+    With clean, a worktree and branch left by an earlier batch are removed
+    first; otherwise they make the job fail. A worktree whose dependency
+    merge fails is removed again.
+    """
+    path = worktree_path(job.stem)
+    branch = f"prp/{job.stem}"
+    if clean:
+        remove_worktree(job.stem)
+    elif path.exists() or branch_exists(branch):
+        raise RuntimeError(
+            f"{path} or branch {branch} is left from an earlier batch "
+            "(pass --clean to recreate it)"
+        )
+    bases = [f"prp/{stem}" for stem in job.depends_on] or ["HEAD"]
+    git("worktree", "add", "-b", branch, str(path), bases[0])
+    try:
+        for base in bases[1:]:
+            git("merge", "--no-edit", base, cwd=path)
+    except RuntimeError:
+        remove_worktree(job.stem)
+        raise
+    return path
+
+
+def commit_worktree(job: BatchJob) -> None:
+    """Commit what the run left in its worktree so dependents build on it."""
+    git("add", "-A", cwd=job.worktree)
+    if git("status", "--porcelain", cwd=job.worktree).strip():
+        git("commit", "-m", f"PRP {job.stem}", cwd=job.worktree)
+
+
+def run_job(
+    job: BatchJob, model: str, output_format: str, ledger: Optional[str]
+) -> int:
+    """Run one PRP through this runner inside its worktree, logging everything."""
+    cmd = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--prp-path",
+        str(job.prp_path),
+        "--model",
+        model,
+        "--output-format",
+        output_format,
+        "--workdir",
+        str(job.worktree),
+    ] + (["--ledger", ledger] if ledger else ["--no-ledger"])
+    with open(job.log_path, "w") as log:
+        return subprocess.run(
+            cmd, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT
+        ).returncode
+
+
+def format_elapsed(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes}m{seconds:02d}s"
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    model: str,
+    output_format: str,
+    max_jobs: int,
+    log_dir: Path,
+    ledger: Optional[str],
+    clean: bool = False,
+) -> int:
+    """Run jobs in dependency order, at most max_jobs at a time."""
+    log_dir.mkdir(parents=True, exist_ok=True)
+    by_stem = {job.stem: job for job in jobs}
+    running: Dict[Future, BatchJob] = {}
+
+    with ThreadPoolExecutor(max_workers=max_jobs) as pool:
+        while True:
+            # jobs are in dependency order, so failures propagate in one pass
+            for job in jobs:
+                if job.status != "pending":
+                    continue
+                deps = [by_stem[stem] for stem in job.depends_on]
+                blocked = [d.stem for d in deps if d.status in ("failed", "skipped")]
+                if blocked:
+                    job.status = "skipped"
+                    job.note = f"dependency failed: {', '.join(blocked)}"
+                    print(f"[skip] {job.stem} ({job.note})", file=sys.stderr)
+                    continue
+                if len(running) >= max_jobs or any(d.status != "ok" for d in deps):
+                    continue
+                try:
+                    job.worktree = create_worktree(job, clean)
+                except RuntimeError as e:
+                    job.status = "failed"
+                    job.note = str(e)
+                    print(f"[fail] {job.stem}: {e}", file=sys.stderr)
+                    continue
+                job.log_path = log_dir / f"{job.stem}.log"
+                job.status = "running"
+                job.started = time.monotonic()
+                print(f"[start] {job.stem} in {job.worktree}", file=sys.stderr)
+                running[pool.submit(run_job, job, model, output_format, ledger)] = job
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                job.finished = time.monotonic()
+                job.returncode = future.result()
+                if job.returncode != 0:
+                    job.status = "failed"
+                    job.note = f"see {job.log_path}"
+                else:
+                    try:
+                        commit_worktree(job)
+                        job.status = "ok"
+                    except RuntimeError as e:
+                        job.status = "failed"
+                        job.note = str(e)
+                print(
+                    f"[{job.status}] {job.stem} "
+                    f"({format_elapsed(job.finished - job.started)}, "
+                    f"exit {job.returncode})",
+                    file=sys.stderr,
+                )
+
+    print_batch_summary(jobs)
+    return 0 if all(job.status == "ok" for job in jobs) else 1
+
+
+def print_batch_summary(jobs: List[BatchJob]) -> None:
+    width = max(len(job.stem) for job in jobs)
+    print("\nBatch summary:", file=sys.stderr)
+    for job in jobs:
+        elapsed = format_elapsed(job.finished - job.started) if job.finished else "-"
+        exit_code = "-" if job.returncode is None else str(job.returncode)
+        print(
+            f"  {job.status:<7} {job.stem:<{width}}  {elapsed:>7}  exit {exit_code:>3}"
+            + (f"  {job.note}" if job.note else ""),
+            file=sys.stderr,
+        )
+    counts = {s: sum(j.status == s for j in jobs) for s in ("ok", "failed", "skipped")}
+    print(
+        f"  {counts['ok']} succeeded, {counts['failed']} failed, "
+        f"{counts['skipped']} skipped",
+        file=sys.stderr,
+    )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run a PRP with an LLM agent.")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["run", "stats"],
+        default="run",
+        help="run a PRP (default) or report on recorded runs",
+    )
     parser.add_argument(
         "--prp-path", help="Relative path to PRP file eg: PRPs/feature.md"
     )
@@ -243,23 +833,117 @@ def main() -> None:
         default="text",
         help="Output format for headless mode (default: text)",
     )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="PRP",
+        help="PRP paths or globs to run in parallel worktrees eg: 'PRPs/02*.md'",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Maximum number of PRPs running at once in batch mode (default: 4)",
+    )
+    parser.add_argument(
+        "--log-dir", help="Directory for batch logs (default: PRPs/logs/<timestamp>)"
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Batch: recreate worktrees and prp/ branches left by an earlier batch",
+    )
+    parser.add_argument(
+        "--ledger",
+        help=f"SQLite run ledger (default: {DEFAULT_LEDGER.relative_to(ROOT.parent)})",
+    )
+    parser.add_argument(
+        "--no-ledger", action="store_true", help="Do not record this run"
+    )
+    parser.add_argument(
+        "--since", type=float, metavar="DAYS", help="stats: only runs in the last DAYS"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="stats: PRPs listed per table (default: 10)"
+    )
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
     args = parser.parse_args()
+    ledger = Path(args.ledger).resolve() if args.ledger else DEFAULT_LEDGER
+
+    if args.command == "stats":
+        print_stats(ledger, args.since, args.top)
+        return
+
+    if args.batch:
+        if args.interactive:
+            sys.exit("--interactive cannot be combined with --batch")
+        if args.jobs < 1:
+            sys.exit("--jobs must be at least 1")
+        jobs = plan_batch(resolve_batch(args.batch))
+        log_dir = (
+            Path(args.log_dir)
+            if args.log_dir
+            else ROOT / "logs" / time.strftime("%Y%m%d-%H%M%S")
+        )
+        sys.exit(
+            run_batch(
+                jobs,
+                args.model,
+                args.output_format,
+                args.jobs,
+                log_dir,
+                None if args.no_ledger else str(ledger),
+                args.clean,
+            )
+        )
 
     if not args.prp_path and not args.prp:
-        sys.exit("Must supply --prp or --prp-path")
+        sys.exit("Must supply --prp, --prp-path or --batch")
 
     prp_path = Path(args.prp_path) if args.prp_path else ROOT / f"PRPs/{args.prp}.md"
     if not prp_path.exists():
         sys.exit(f"PRP not found: {prp_path}")
+    prp_path = prp_path.resolve()
 
-    os.chdir(ROOT)  # ensure relative paths match PRP expectations
     prompt = build_prompt(prp_path)
-    run_model(
-        prompt,
-        model=args.model,
-        interactive=args.interactive,
-        output_format=args.output_format,
-    )
+    prp_sha256 = hashlib.sha256(prp_path.read_bytes()).hexdigest()
+    os.chdir(args.workdir or ROOT)  # ensure relative paths match PRP expectations
+    if args.interactive or args.no_ledger:
+        run_model(
+            prompt,
+            model=args.model,
+            interactive=args.interactive,
+            output_format=args.output_format,
+        )
+        return
+
+    result: Dict[str, Any] = {}
+    started_at = datetime.now(timezone.utc)
+    started = time.monotonic()
+    exit_code = 1
+    try:
+        run_model(
+            prompt, model=args.model, output_format=args.output_format, summary=result
+        )
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+        raise
+    except subprocess.CalledProcessError as e:
+        exit_code = e.returncode
+        raise
+    finally:
+        record_run(
+            ledger,
+            prp_path,
+            prp_sha256,
+            args.model,
+            args.output_format,
+            started_at,
+            time.monotonic() - started,
+            exit_code,
+            result,
+        )
 
 
 if __name__ == "__main__":
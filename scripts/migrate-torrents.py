@@ -7,6 +7,8 @@ Usage:
     ./migrate-torrents.py --direction tr2qb --dry-run     # Preview migration
     ./migrate-torrents.py --direction tr2qb               # Migrate Transmission → qBittorrent
     ./migrate-torrents.py --direction qb2tr               # Migrate qBittorrent → Transmission
+    ./migrate-torrents.py plan -d tr2qb -o plan.jsonl     # Write a plan with cost estimates
+    ./migrate-torrents.py apply plan.jsonl                # Execute a plan
 
 Requirements:
     pip install qbittorrent-api>=2024.1.59 transmission-rpc>=7.0.3 python3-libtorrent
@@ -17,14 +19,33 @@ Configuration:
 
 import argparse
 import base64
+import errno
+import hashlib
 import json
+import os
+import random
+import shutil
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-import qbittorrentapi
-import transmission_rpc
+# qbittorrentapi and transmission_rpc are imported by their handlers on first use;
+# together they are most of the start-up time and --help or a bad config needs neither
+
+
+CLIENTS = ('transmission', 'qbittorrent')
+
+# Ordered from cheapest to most expensive; 'copy' always works but moves every byte
+RELOCATE_STRATEGIES = ('reflink', 'hardlink', 'copy')
+
+# Bumped whenever the plan file layout changes; apply refuses other versions
+PLAN_VERSION = 1
+
+# Drift report categories, in the order the audit summary lists them
+AUDIT_CATEGORIES = ('missing_in_qbittorrent', 'missing_in_transmission', 'save_path', 'labels', 'completion')
 
 
 # ============================================================================
@@ -57,6 +78,27 @@ def load_config(config_path: str = 'config.json') -> Dict[str, Any]:
         config['migration'].setdefault('pause_source', True)
         config['migration'].setdefault('resume_destination', False)
         config['migration'].setdefault('rate_limit_sleep', 0.5)
+        config['migration'].setdefault('page_size', 500)
+        config['migration'].setdefault('torrent_cache_max_bytes', 512 * 1024 * 1024)
+        config['migration'].setdefault('path_mappings', [])
+        config['migration'].setdefault('local_path_mappings', {})
+        config['migration'].setdefault('relocate_data', False)
+        config['migration'].setdefault('relocate_strategies', list(RELOCATE_STRATEGIES))
+        config['migration'].setdefault('relocate_copy_workers', 4)
+
+        # rate_limit_sleep is kept as the starting pace of each client's rate controller
+        for client in CLIENTS:
+            rate_control = config[client].setdefault('rate_control', {})
+            rate_control.setdefault('initial_delay', config['migration']['rate_limit_sleep'])
+
+        # Validate path mapping rules
+        for rule in config['migration']['path_mappings']:
+            for client in CLIENTS:
+                if client not in rule:
+                    raise ValueError(f"Missing {client} prefix in migration.path_mappings entry: {rule}")
+        for strategy in config['migration']['relocate_strategies']:
+            if strategy not in RELOCATE_STRATEGIES:
+                raise ValueError(f"Unknown relocate strategy: {strategy}")
 
         return config
 
@@ -79,17 +121,806 @@ def create_temp_dir(base_dir: str = '.migration-state') -> str:
     return str(temp_path.absolute())
 
 
-def print_progress(current: int, total: int, torrent_name: str, max_name_length: int = 50):
-    """Print migration progress."""
+def print_progress(current: int, total: Optional[int], torrent_name: str, max_name_length: int = 50):
+    """Print migration progress. total may be None when the source is streamed."""
     if len(torrent_name) > max_name_length:
         display_name = torrent_name[:max_name_length-3] + "..."
     else:
         display_name = torrent_name
 
-    percentage = (current / total * 100) if total > 0 else 0
+    if not total:
+        print(f"[{current}] {display_name}")
+        return
+
+    percentage = min(current / total * 100, 100.0)
     print(f"[{current}/{total}] ({percentage:.1f}%) {display_name}")
 
 
+def format_bytes(size: float) -> str:
+    """Format a byte count for display."""
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if abs(size) < 1024 or unit == 'TiB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{int(size)} B"
+        size /= 1024
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration for display."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
+
+
+def measure_read_throughput(path: Path, sample_bytes: int = 64 * 1024 * 1024) -> Optional[float]:
+    """
+    Time a hashed sequential read of up to sample_bytes under path.
+
+    Returns bytes per second, or None when nothing could be read. Recently
+    read data may come from the page cache, so treat the result as an upper
+    bound.
+    """
+    files = [path] if path.is_file() else sorted(p for p in path.rglob('*') if p.is_file())
+    digest = hashlib.sha1()
+    read = 0
+    start = time.monotonic()
+    try:
+        for file_path in files:
+            with open(file_path, 'rb') as f:
+                while read < sample_bytes:
+                    chunk = f.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    read += len(chunk)
+            if read >= sample_bytes:
+                break
+    except OSError:
+        return None
+
+    elapsed = time.monotonic() - start
+    if not read or elapsed <= 0:
+        return None
+    return read / elapsed
+
+
+def _batched(items: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterator into lists of at most size items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============================================================================
+# Path Mapping and Data Relocation
+# ============================================================================
+
+def _rewrite_prefix(path: str, rules: List[Tuple[str, str]]) -> Optional[str]:
+    """Rewrite path using the longest matching prefix rule, or None if no rule matches."""
+    for old_prefix, new_prefix in rules:
+        # Only match whole path components: /downloads must not match /downloads2
+        if path == old_prefix or path.startswith(old_prefix + '/'):
+            return new_prefix + path[len(old_prefix):]
+    return None
+
+
+def _sorted_rules(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Normalise prefix rules and order them longest-first."""
+    rules = [(old.rstrip('/'), new.rstrip('/')) for old, new in pairs]
+    return sorted(rules, key=lambda rule: len(rule[0]), reverse=True)
+
+
+class PathMapper:
+    """
+    Translate save paths between clients and to paths visible to this script.
+
+    path_mappings pairs the prefix each client uses for the same data, e.g.
+    {"transmission": "/downloads", "qbittorrent": "/data/torrents"}.
+    local_path_mappings maps a client's prefix to where this script can read
+    or write it, and is only needed when data has to be relocated.
+    """
+
+    def __init__(self, migration_config: Dict[str, Any]):
+        pairs = migration_config.get('path_mappings', [])
+        self._rules = {
+            ('transmission', 'qbittorrent'): _sorted_rules(
+                [(rule['transmission'], rule['qbittorrent']) for rule in pairs]),
+            ('qbittorrent', 'transmission'): _sorted_rules(
+                [(rule['qbittorrent'], rule['transmission']) for rule in pairs]),
+        }
+        self._local_rules = {
+            client: _sorted_rules(list(migration_config.get('local_path_mappings', {}).get(client, {}).items()))
+            for client in CLIENTS
+        }
+
+    def translate(self, path: str, source: str, destination: str) -> str:
+        """Translate a source client's path to the destination client's view of it."""
+        rewritten = _rewrite_prefix(path, self._rules[(source, destination)])
+        return rewritten if rewritten is not None else path
+
+    def local_path(self, path: str, client: str) -> Path:
+        """Resolve a client path to the path this script sees it at."""
+        rewritten = _rewrite_prefix(path, self._local_rules[client])
+        return Path(rewritten if rewritten is not None else path)
+
+
+class DataRelocator:
+    """
+    Materialise a torrent payload at a new location without re-downloading it.
+
+    Each file is placed using the first strategy that works: a reflink (CoW
+    clone, btrfs/XFS/ZFS), then a hardlink (same filesystem), and only then a
+    parallel copy whose result is verified against the source checksum.
+    Strategies that fail for filesystem reasons are not retried for the
+    remaining files of the payload.
+    """
+
+    FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+    CHUNK_SIZE = 4 * 1024 * 1024
+
+    # errno values meaning "this strategy cannot work here", as opposed to real I/O errors
+    UNSUPPORTED_ERRNOS = {
+        errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL,
+        errno.ENOTTY, errno.EPERM, errno.EMLINK, errno.ENOSYS,
+    }
+
+    def __init__(self, migration_config: Dict[str, Any]):
+        self.strategies = list(migration_config.get('relocate_strategies', RELOCATE_STRATEGIES))
+        self.copy_workers = max(1, int(migration_config.get('relocate_copy_workers', 4)))
+
+    def relocate(self, source: Path, destination: Path) -> Dict[str, Any]:
+        """Materialise source (a file or directory tree) at destination."""
+        if not source.exists():
+            raise FileNotFoundError(f"Source data not found: {source}")
+
+        if source.is_dir():
+            pairs = [
+                (path, destination / path.relative_to(source))
+                for path in sorted(source.rglob('*')) if path.is_file()
+            ]
+        else:
+            pairs = [(source, destination)]
+
+        stats = {'files': 0, 'bytes': 0, 'existing': 0, 'reflink': 0, 'hardlink': 0, 'copy': 0}
+        strategies = [s for s in self.strategies if s != 'copy']
+        to_copy = []
+
+        for src, dst in pairs:
+            size = src.stat().st_size
+            stats['files'] += 1
+            stats['bytes'] += size
+
+            if dst.exists():
+                if dst.stat().st_size != size:
+                    raise FileExistsError(f"Destination exists with different size: {dst}")
+                stats['existing'] += 1
+                continue
+
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            for strategy in list(strategies):
+                try:
+                    if strategy == 'reflink':
+                        self._reflink(src, dst)
+                    else:
+                        os.link(src, dst)
+                    stats[strategy] += 1
+                    break
+                except OSError as e:
+                    if e.errno not in self.UNSUPPORTED_ERRNOS:
+                        raise
+                    strategies.remove(strategy)
+            else:
+                to_copy.append((src, dst))
+
+        if to_copy:
+            if 'copy' not in self.strategies:
+                raise OSError(f"No configured relocate strategy works for {source} → {destination}")
+            with ThreadPoolExecutor(max_workers=self.copy_workers) as pool:
+                for _ in pool.map(lambda pair: self._verified_copy(*pair), to_copy):
+                    stats['copy'] += 1
+
+        return stats
+
+    def _reflink(self, src: Path, dst: Path):
+        """Clone src into dst sharing the same extents."""
+        import fcntl
+
+        with open(src, 'rb') as fsrc, open(dst, 'xb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), self.FICLONE, fsrc.fileno())
+            except OSError:
+                fdst.close()
+                dst.unlink()
+                raise
+        shutil.copystat(src, dst)
+
+    def _verified_copy(self, src: Path, dst: Path):
+        """Copy src to dst, then re-read dst and compare checksums before publishing it."""
+        partial = dst.with_name(dst.name + '.partial')
+        source_digest = hashlib.blake2b()
+
+        try:
+            with open(src, 'rb') as fsrc, open(partial, 'wb') as fdst:
+                while chunk := fsrc.read(self.CHUNK_SIZE):
+                    source_digest.update(chunk)
+                    fdst.write(chunk)
+
+            copy_digest = hashlib.blake2b()
+            with open(partial, 'rb') as f:
+                while chunk := f.read(self.CHUNK_SIZE):
+                    copy_digest.update(chunk)
+
+            if copy_digest.digest() != source_digest.digest():
+                raise IOError(f"Checksum mismatch copying {src} → {dst}")
+
+            shutil.copystat(src, partial)
+            os.replace(partial, dst)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+
+
+# ============================================================================
+# Adaptive Rate Control
+# ============================================================================
+
+class AdaptiveRateController:
+    """
+    Pace and bound the calls made to one torrent client.
+
+    Concurrency and the delay between calls adapt AIMD-style: each fast
+    success adds to the concurrency window and shrinks the delay by
+    delay_decay (or delay_step, whichever is more), while a failure or a
+    response slower than latency_target halves the window and doubles the
+    delay. Bulk listing calls are judged against bulk_latency_target
+    instead, since a page of hundreds of torrents is slow by nature.
+    Transient failures are retried with jittered exponential backoff. After
+    failure_threshold consecutive failed calls (each counted once, after its
+    retries) the circuit opens and new calls wait until cooldown has passed,
+    so a struggling client gets a rest instead of a stream of calls that are
+    bound to fail.
+    """
+
+    def __init__(self, name: str, config: Dict[str, Any], is_retryable: Callable[[Exception], bool]):
+        self.name = name
+        self.is_retryable = is_retryable
+
+        self.min_delay = float(config.get('min_delay', 0.0))
+        self.max_delay = float(config.get('max_delay', 10.0))
+        self.delay_step = float(config.get('delay_step', 0.05))
+        self.delay_decay = float(config.get('delay_decay', 0.7))
+        self.delay = float(config.get('initial_delay', 0.5))
+        self.burst = max(0, int(config.get('burst', 4)))
+        self.max_concurrency = max(1, int(config.get('max_concurrency', 8)))
+        self.limit = float(min(config.get('initial_concurrency', 1), self.max_concurrency))
+        self.latency_target = float(config.get('latency_target', 2.0))
+        self.bulk_latency_target = float(config.get('bulk_latency_target', 30.0))
+        self.max_retries = int(config.get('max_retries', 4))
+        self.backoff_base = float(config.get('backoff_base', 0.5))
+        self.backoff_max = float(config.get('backoff_max', 30.0))
+        self.failure_threshold = int(config.get('failure_threshold', 5))
+        self.cooldown = float(config.get('cooldown', 30.0))
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._next_start = 0.0
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        # calls and latency cover every attempt; the bulk_ entries are the listing share of them
+        self.stats = {'calls': 0, 'failures': 0, 'retries': 0, 'latency': 0.0, 'bulk_calls': 0, 'bulk_latency': 0.0}
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call fn through the controller, retrying transient failures."""
+        return self._call(False, fn, args, kwargs)
+
+    def call_bulk(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Like call, for listing calls whose latency scales with the page size."""
+        return self._call(True, fn, args, kwargs)
+
+    def _call(
+        self,
+        bulk: bool,
+        fn: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        attempt = 0
+        while True:
+            self._acquire()
+            start = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                retryable = self.is_retryable(e)
+                # Client-side errors (bad request, not found, ...) say nothing about load
+                self._release(time.monotonic() - start, retryable, bulk)
+                if not retryable or attempt >= self.max_retries:
+                    self._record_outcome(failed=retryable)
+                    raise
+                attempt += 1
+                backoff = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+                backoff *= random.uniform(0.5, 1.0)
+                with self._cond:
+                    self.stats['retries'] += 1
+                print(f"  ↻ {self.name}: {e} - retry {attempt}/{self.max_retries} in {backoff:.1f}s")
+                time.sleep(backoff)
+                continue
+
+            self._release(time.monotonic() - start, False, bulk)
+            self._record_outcome(failed=False)
+            return result
+
+    @property
+    def mean_latency(self) -> float:
+        """Average response time of completed calls, in seconds."""
+        with self._cond:
+            return self.stats['latency'] / self.stats['calls'] if self.stats['calls'] else 0.0
+
+    @property
+    def call_latency(self) -> Optional[float]:
+        """Average response time of single calls, leaving out listings; None before the first."""
+        with self._cond:
+            calls = self.stats['calls'] - self.stats['bulk_calls']
+            return (self.stats['latency'] - self.stats['bulk_latency']) / calls if calls else None
+
+    def _acquire(self):
+        """Wait out an open circuit, then for a concurrency slot and the next paced start time."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._open_until:
+                    self._cond.wait(self._open_until - now)
+                    continue
+                if self._in_flight < int(self.limit):
+                    break
+                self._cond.wait()
+
+            self._in_flight += 1
+            # Up to burst calls may start back to back before the delay paces them (GCRA), so the
+            # handful of calls a no-op sync makes never wait
+            start_at = max(now, self._next_start - self.burst * self.delay)
+            self._next_start = max(self._next_start, start_at) + self.delay
+
+        wait_time = start_at - time.monotonic()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def _release(self, elapsed: float, failed: bool, bulk: bool):
+        """Record a finished attempt and adapt the window and delay."""
+        with self._cond:
+            self._in_flight -= 1
+            self.stats['calls'] += 1
+            self.stats['latency'] += elapsed
+            if bulk:
+                self.stats['bulk_calls'] += 1
+                self.stats['bulk_latency'] += elapsed
+            if failed:
+                self.stats['failures'] += 1
+
+            if failed or elapsed > (self.bulk_latency_target if bulk else self.latency_target):
+                self.limit = max(1.0, self.limit / 2)
+                self.delay = min(self.max_delay, max(self.delay * 2, self.delay_step))
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+                # Proportional recovery: max_delay is back under 50ms after about fifteen calls
+                self.delay = max(self.min_delay, min(self.delay * self.delay_decay, self.delay - self.delay_step))
+
+            self._cond.notify_all()
+
+    def _record_outcome(self, failed: bool):
+        """Update the circuit breaker with the outcome of a whole call, retries included."""
+        with self._cond:
+            if not failed:
+                self._consecutive_failures = 0
+                return
+
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.cooldown
+                print(f"  ⚡ {self.name}: {self._consecutive_failures} consecutive failed calls, "
+                      f"pausing calls for {self.cooldown:.0f}s")
+
+
+# ============================================================================
+# Torrent Records
+# ============================================================================
+
+class TorrentRecord:
+    """
+    Compact, client-neutral view of a torrent.
+
+    Holds only the fields the migrator uses. The info-hash is kept as 20 raw
+    bytes and repeated strings (save paths, labels, categories) are interned,
+    so six-figure libraries fit in a fraction of the memory the client
+    library objects need.
+    """
+
+    __slots__ = (
+        'info_hash', 'info_hash_v1', 'info_hash_v2', 'torrent_id',
+        'name', 'save_path', 'progress', 'size', 'labels', 'category', 'content_path',
+    )
+
+    def __init__(
+        self,
+        info_hash: bytes,
+        name: str,
+        save_path: str,
+        progress: float,
+        size: int = 0,
+        labels: Tuple[str, ...] = (),
+        category: Optional[str] = None,
+        torrent_id: Optional[int] = None,
+        info_hash_v1: Optional[bytes] = None,
+        info_hash_v2: Optional[bytes] = None,
+        content_path: Optional[str] = None
+    ):
+        # info_hash is the id the client itself uses: v1, or truncated v2 for v2-only torrents
+        self.info_hash = info_hash
+        self.info_hash_v1 = info_hash if info_hash_v1 == info_hash else info_hash_v1
+        self.info_hash_v2 = info_hash_v2
+        self.torrent_id = torrent_id
+        self.name = name
+        self.save_path = sys.intern(save_path)
+        self.progress = progress
+        self.size = size
+        self.labels = tuple(sys.intern(label) for label in labels)
+        self.category = sys.intern(category) if category else None
+        # Where the client keeps the payload when it says so (qBittorrent); else save_path/name
+        self.content_path = content_path
+
+    @property
+    def hash(self) -> str:
+        """Info-hash as the lowercase hex string the client APIs expect."""
+        return self.info_hash.hex()
+
+    @property
+    def is_complete(self) -> bool:
+        return self.progress >= 1.0
+
+    @property
+    def canonical_hash(self) -> bytes:
+        """Identity shared by both clients: the v1 hash when known, else the client id."""
+        return self.info_hash_v1 or self.info_hash
+
+    def identities(self) -> Tuple[bytes, ...]:
+        """Every hash this torrent may be known by: client id, v1, v2 and truncated v2."""
+        ids = [self.info_hash]
+        if self.info_hash_v1 and self.info_hash_v1 != self.info_hash:
+            ids.append(self.info_hash_v1)
+        if self.info_hash_v2:
+            ids.extend((self.info_hash_v2, self.info_hash_v2[:20]))
+        return tuple(ids)
+
+    def __repr__(self) -> str:
+        return f"TorrentRecord({self.hash}, {self.name!r})"
+
+
+def parse_hash(hex_hash: str) -> bytes:
+    """Convert a hex info-hash from a client API into its binary form."""
+    return bytes.fromhex(hex_hash)
+
+
+# ============================================================================
+# Transfer Settings
+# ============================================================================
+
+def transfer_settings(
+    wanted: List[bool],
+    priorities: List[int],
+    sequential: bool = False,
+    download_limit: int = 0,
+    upload_limit: int = 0,
+    ratio_limit: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Build the client-neutral per-torrent transfer settings.
+
+    File priorities use Transmission's scale (-1 low, 0 normal, 1 high) and
+    are indexed like the files in the .torrent. Speed limits are bytes per
+    second with 0 for unlimited; ratio_limit is None to follow the client's
+    global setting and -1 for no limit. File lists that select and weight
+    every file equally are dropped, so torrents without a custom selection
+    cost nothing to migrate.
+    """
+    return {
+        'wanted': wanted if not all(wanted) else None,
+        'priorities': priorities if any(priorities) else None,
+        'sequential': sequential,
+        'download_limit': max(0, int(download_limit)),
+        'upload_limit': max(0, int(upload_limit)),
+        'ratio_limit': ratio_limit
+    }
+
+
+def describe_transfer(settings: Optional[Dict[str, Any]]) -> str:
+    """Summarise the non-default parts of transfer settings, or '' if there are none."""
+    if not settings:
+        return ''
+
+    parts = []
+    if settings['wanted']:
+        parts.append(f"{sum(settings['wanted'])}/{len(settings['wanted'])} files wanted")
+    if settings['priorities']:
+        high = sum(1 for p in settings['priorities'] if p > 0)
+        low = sum(1 for p in settings['priorities'] if p < 0)
+        parts.append(f"{high} high / {low} low priority files")
+    if settings['sequential']:
+        parts.append("sequential")
+    if settings['download_limit']:
+        parts.append(f"↓ {format_bytes(settings['download_limit'])}/s")
+    if settings['upload_limit']:
+        parts.append(f"↑ {format_bytes(settings['upload_limit'])}/s")
+    if settings['ratio_limit'] is not None:
+        parts.append("no ratio limit" if settings['ratio_limit'] < 0 else f"ratio {settings['ratio_limit']:g}")
+    return ', '.join(parts)
+
+
+# ============================================================================
+# Info-Hash Identity
+# ============================================================================
+
+def _bdecode(data: bytes, pos: int = 0) -> Tuple[Any, int]:
+    """Decode one bencoded value starting at pos; returns (value, end position)."""
+    token = data[pos:pos + 1]
+    if token == b'i':
+        end = data.index(b'e', pos)
+        return int(data[pos + 1:end]), end + 1
+    if token == b'l':
+        items, pos = [], pos + 1
+        while data[pos:pos + 1] != b'e':
+            item, pos = _bdecode(data, pos)
+            items.append(item)
+        return items, pos + 1
+    if token == b'd':
+        items, pos = {}, pos + 1
+        while data[pos:pos + 1] != b'e':
+            key, pos = _bdecode(data, pos)
+            items[key], pos = _bdecode(data, pos)
+        return items, pos + 1
+    if token.isdigit():
+        colon = data.index(b':', pos)
+        end = colon + 1 + int(data[pos:colon])
+        return data[colon + 1:end], end
+    raise ValueError(f"Invalid bencoded data at offset {pos}")
+
+
+def bdecode(data: bytes) -> Any:
+    """Decode a complete bencoded document such as a .torrent or .fastresume file."""
+    value, _ = _bdecode(data)
+    return value
+
+
+def bencode(value: Any) -> bytes:
+    """Encode a value as bencode; dictionary keys are written in sorted order."""
+    if isinstance(value, int):
+        return b'i%de' % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b'%d:%s' % (len(value), value)
+    if isinstance(value, list):
+        return b'l' + b''.join(bencode(item) for item in value) + b'e'
+    if isinstance(value, dict):
+        items = sorted((k.encode() if isinstance(k, str) else k, v) for k, v in value.items())
+        return b'd' + b''.join(bencode(k) + bencode(v) for k, v in items) + b'e'
+    raise TypeError(f"Cannot bencode {type(value).__name__}")
+
+
+def _raw_top_level(data: bytes) -> List[Tuple[bytes, bytes]]:
+    """Split a bencoded dictionary into (key, raw encoded value) pairs without re-encoding."""
+    if data[:1] != b'd':
+        raise ValueError("Not a bencoded dictionary")
+
+    pairs = []
+    pos = 1
+    while data[pos:pos + 1] != b'e':
+        key, pos = _bdecode(data, pos)
+        value_start = pos
+        _, pos = _bdecode(data, pos)
+        pairs.append((key, data[value_start:pos]))
+    return pairs
+
+
+def torrent_info_hashes(data: bytes) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """
+    Compute (v1, v2) info-hashes from .torrent file contents.
+
+    Both are hashes of the raw bencoded info dictionary: SHA-1 for v1, SHA-256
+    for v2. Hybrid torrents have both, v2-only torrents have no v1.
+    """
+    for key, raw_info in _raw_top_level(data):
+        if key == b'info':
+            info = bdecode(raw_info)
+            v1 = hashlib.sha1(raw_info).digest() if b'pieces' in info else None
+            v2 = hashlib.sha256(raw_info).digest() if info.get(b'meta version') == 2 else None
+            return v1, v2
+
+    raise ValueError("No info dictionary in torrent")
+
+
+def torrent_layout(data: bytes) -> Tuple[str, List[str]]:
+    """
+    Read the payload name and top-level entries from .torrent file contents.
+
+    For multi-file torrents the entries are the files and directories
+    directly inside the root folder; a single-file torrent has none, its
+    name being the file itself. Padding files are left out.
+    """
+    info = bdecode(dict(_raw_top_level(data))[b'info'])
+    name = os.fsdecode(info[b'name'])
+    if b'files' in info:
+        entries = {
+            os.fsdecode(entry[b'path'][0]) for entry in info[b'files']
+            if b'p' not in entry.get(b'attr', b'')
+        }
+    elif b'length' in info:
+        entries = set()
+    else:
+        # v2-only: a single-file tree holds just the file, keyed by the torrent name
+        tree = info.get(b'file tree', {})
+        single = list(tree) == [info[b'name']] and b'' in tree[info[b'name']]
+        entries = set() if single else {os.fsdecode(key) for key in tree}
+    return name, sorted(entries)
+
+
+class InfoHashIndex:
+    """
+    Resolve any identity of a torrent to the id one client uses for it.
+
+    Hybrid torrents are known by their v1 hash, v2 hash and truncated v2
+    hash, and the two clients don't agree on which of them to report. Every
+    identity of each indexed torrent points at the indexing client's own id,
+    so dedup is a single lookup and the result addresses the matching
+    torrent directly.
+    """
+
+    def __init__(self):
+        self._ids: Dict[bytes, bytes] = {}
+        self._count = 0
+
+    def add(self, record: TorrentRecord):
+        self._count += 1
+        for identity in record.identities():
+            self._ids.setdefault(identity, record.info_hash)
+
+    def lookup(self, record: TorrentRecord) -> Optional[bytes]:
+        """Get the indexed client's id for this torrent, or None if it isn't there."""
+        for identity in record.identities():
+            found = self._ids.get(identity)
+            if found is not None:
+                return found
+        return None
+
+    def __contains__(self, record: TorrentRecord) -> bool:
+        return self.lookup(record) is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+
+# ============================================================================
+# Torrent File Cache
+# ============================================================================
+
+class TorrentCache:
+    """
+    Content-addressed store of .torrent files, shared by both directions and across runs.
+
+    A .torrent never changes, so once exported it never has to be fetched
+    again. Entries are named by the info-hash computed from their own
+    contents (v1, or v2 for v2-only torrents) and re-verified on every read,
+    so a corrupt entry is dropped instead of being handed to a client. Total
+    size is bounded by max_bytes, evicting the least recently used entries.
+    """
+
+    # Evict down to this fraction of max_bytes so eviction doesn't run on every put
+    EVICT_TO = 0.9
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: bytes) -> Path:
+        name = key.hex()
+        return self.cache_dir / name[:2] / f"{name}.torrent"
+
+    def get(self, record: TorrentRecord) -> Optional[str]:
+        """Get the path of a verified cached .torrent for record, or None on a miss."""
+        for key in (record.info_hash_v1, record.info_hash_v2, record.info_hash):
+            if not key:
+                continue
+
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                continue
+
+            try:
+                valid = key in torrent_info_hashes(data)
+            except ValueError:
+                valid = False
+            if not valid:
+                print(f"  ⚠ Dropping corrupt cache entry {path.name}")
+                self._discard(path, len(data))
+                continue
+
+            os.utime(path)  # mtime doubles as last-used time for LRU eviction
+            self.stats['hits'] += 1
+            return str(path)
+
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, data: bytes) -> str:
+        """Store .torrent contents under their own info-hash and return the cached path."""
+        v1, v2 = torrent_info_hashes(data)
+        path = self._path(v1 or v2)
+
+        if path.exists():
+            os.utime(path)
+            return str(path)
+
+        path.parent.mkdir(exist_ok=True)
+        partial = path.with_suffix('.partial')
+        partial.write_bytes(data)
+        os.replace(partial, path)
+
+        self.stats['stored'] += 1
+        self._account(len(data))
+        return str(path)
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """List cached files as (last used, size, path)."""
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.torrent'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        return entries
+
+    def _account(self, delta: int):
+        """Track the cache size and evict least recently used entries past max_bytes."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += delta
+
+            if self._size <= self.max_bytes:
+                return
+
+            target = self.max_bytes * self.EVICT_TO
+            for _, size, path in sorted(self._entries()):
+                if self._size <= target:
+                    break
+                path.unlink(missing_ok=True)
+                self._size -= size
+                self.stats['evicted'] += 1
+
+    def _discard(self, path: Path, size: int):
+        path.unlink(missing_ok=True)
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+
 # ============================================================================
 # qBittorrent Handler
 # ============================================================================
@@ -97,27 +928,55 @@ def print_progress(current: int, total: int, torrent_name: str, max_name_length:
 class QBittorrentHandler:
     """Handler for qBittorrent API operations."""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], state_dir: Optional[str] = None):
         self.config = config
         self.client = None
         self.connected = False
+        self.rate = AdaptiveRateController('qBittorrent', config.get('rate_control', {}), self._is_retryable)
+        self.web_api_version: Tuple[int, ...] = (0,)
+        self._bt_backup_listing: Optional[Dict[str, int]] = None
+        self._session_file = Path(state_dir) / 'qbittorrent-session.json' if state_dir else None
 
     def connect(self) -> bool:
-        """Connect to qBittorrent and authenticate."""
+        """Connect to qBittorrent, reusing the cached login session when it is still valid."""
+        import qbittorrentapi
+
         try:
+            # With a configured protocol the client skips its HTTP/HTTPS probe request
+            protocol = self.config.get('protocol')
             self.client = qbittorrentapi.Client(
-                host=self.config['host'],
+                host=f"{protocol}://{self.config['host']}" if protocol else self.config['host'],
                 port=self.config['port'],
                 username=self.config['username'],
-                password=self.config['password']
+                password=self.config['password'],
+                FORCE_SCHEME_FROM_HOST=bool(protocol)
             )
 
-            # CRITICAL: Must call auth_log_in() for operations to work
-            self.client.auth_log_in()
+            session = self._load_session()
+            if session:
+                # qbittorrentapi has no public setter for the SID and resets its HTTP session when
+                # it first resolves the URL, so resolve it before planting the cookie. If the SID
+                # has expired, the next call gets a 403 and the client logs in again by itself
+                self.client._url.build_base_url(headers={}, requests_kwargs={})
+                for name, value in session['cookies'].items():
+                    self.client._session.cookies.set(name, value)
+            else:
+                # CRITICAL: Must call auth_log_in() for operations to work
+                self.client.auth_log_in()
 
-            # Verify connection by getting version
-            version = self.client.app.version
-            print(f"✓ Connected to qBittorrent {version}")
+            # Verify connection by getting the Web API version (needed for feature checks anyway)
+            web_api_version = str(self.client.app.web_api_version)
+            self.web_api_version = tuple(int(part) for part in web_api_version.split('.'))
+
+            # A kept cookie means the same qBittorrent process, so its cached version still holds
+            cookies = self._session_cookies()
+            if session and cookies == session['cookies'] and session.get('web_api_version') == web_api_version:
+                version = session['version']
+            else:
+                version = str(self.client.app.version)
+            self._save_session(cookies, version, web_api_version)
+
+            print(f"✓ Connected to qBittorrent {version}{' (cached session)' if session else ''}")
             self.connected = True
             return True
 
@@ -132,32 +991,259 @@ class QBittorrentHandler:
             print(f"✗ Unexpected error connecting to qBittorrent: {e}")
             return False
 
-    def get_torrents(self) -> List[Any]:
+    def _session_key(self) -> str:
+        """Identify the server and account a cached session belongs to."""
+        return f"{self.config['host']}:{self.config['port']}:{self.config['username']}"
+
+    def _session_cookies(self) -> Dict[str, str]:
+        """The login cookie: SID, or QBT_SID_<port> since qBittorrent 5.2."""
+        return {
+            cookie.name: cookie.value
+            for cookie in self.client._session.cookies
+            if cookie.name == 'SID' or cookie.name.startswith('QBT_SID_')
+        }
+
+    def _load_session(self) -> Optional[Dict[str, Any]]:
+        """Read the cached session for this server and account, if there is one."""
+        if not self._session_file:
+            return None
+        try:
+            session = json.loads(self._session_file.read_text())
+        except (OSError, ValueError):
+            return None
+        if session.get('key') != self._session_key() or not session.get('cookies'):
+            return None
+        return session
+
+    def _save_session(self, cookies: Dict[str, str], version: str, web_api_version: str):
+        """Cache the login cookie for the next run; the file is private to the user."""
+        if not self._session_file or not cookies:
+            return
+        session = {
+            'key': self._session_key(),
+            'cookies': cookies,
+            'version': version,
+            'web_api_version': web_api_version,
+            'saved': time.time()
+        }
+        try:
+            fd = os.open(self._session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(session, f)
+        except OSError as e:
+            print(f"  ⚠ Could not cache qBittorrent session: {e}")
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Connection errors, timeouts and 5xx/429 responses are transient; other 4xx are not."""
+        import qbittorrentapi
+
+        if isinstance(error, qbittorrentapi.LoginFailed):
+            return False
+        if isinstance(error, qbittorrentapi.HTTP5XXError):
+            return True
+        if isinstance(error, qbittorrentapi.HTTPError):
+            return getattr(getattr(error, 'response', None), 'status_code', None) == 429
+        return isinstance(error, (qbittorrentapi.APIConnectionError, ConnectionError, TimeoutError))
+
+    def get_torrents(self) -> List[TorrentRecord]:
         """Get all torrents from qBittorrent."""
+        return list(self.iter_torrents())
+
+    def iter_torrents(self, page_size: int = 500) -> Iterator[TorrentRecord]:
+        """
+        Yield torrents from qBittorrent one page at a time.
+
+        Pages are sorted by add time so torrents added during iteration land
+        on later pages instead of shifting the ones not yet read.
+        """
+        if not self.connected:
+            raise RuntimeError("Not connected to qBittorrent. Call connect() first.")
+
+        offset = 0
+        while True:
+            try:
+                page = self.rate.call_bulk(self.client.torrents_info, sort='added_on', limit=page_size, offset=offset)
+            except Exception as e:
+                print(f"✗ Error getting torrents from qBittorrent: {e}")
+                raise
+
+            for torrent in page:
+                yield self._record(torrent)
+            if len(page) < page_size:
+                return
+            offset += page_size
+
+    @staticmethod
+    def _record(torrent: Any) -> TorrentRecord:
+        """Project a qBittorrent torrent onto a TorrentRecord."""
+        tags = torrent.get('tags') or ''
+        # infohash_v1/v2 exist since qBittorrent 4.4 and are empty when not applicable
+        v1 = torrent.get('infohash_v1')
+        v2 = torrent.get('infohash_v2')
+        return TorrentRecord(
+            info_hash=parse_hash(torrent['hash']),
+            info_hash_v1=parse_hash(v1) if v1 else None,
+            info_hash_v2=parse_hash(v2) if v2 else None,
+            name=torrent['name'],
+            save_path=torrent['save_path'],
+            progress=torrent['progress'],
+            size=torrent.get('total_size') or torrent.get('size') or 0,
+            labels=tuple(tag.strip() for tag in tags.split(',') if tag.strip()),
+            category=torrent.get('category') or None,
+            content_path=torrent.get('content_path') or None
+        )
+
+    def count_torrents(self) -> Optional[int]:
+        """Get the number of torrents, or None if this qBittorrent can't report it cheaply."""
         if not self.connected:
             raise RuntimeError("Not connected to qBittorrent. Call connect() first.")
 
         try:
-            return self.client.torrents_info()
-        except Exception as e:
-            print(f"✗ Error getting torrents from qBittorrent: {e}")
-            raise
+            # torrents/count needs Web API 2.9.3+; older versions return None
+            return self.rate.call(self.client.torrents_count)
+        except Exception:
+            return None
+
+    def get_transfer_settings(self, records: List[TorrentRecord]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch file selection, priorities, sequential mode and limits for a batch of torrents.
+
+        Limits come from a single torrents/info call for the whole batch.
+        File priorities are read from each .fastresume when BT_backup is
+        configured and only fall back to one torrents/files call per torrent.
+        """
+        if not records:
+            return {}
+        if not self.connected:
+            raise RuntimeError("Not connected to qBittorrent. Call connect() first.")
+
+        settings = {}
+        for torrent in self.rate.call_bulk(self.client.torrents_info, torrent_hashes=[r.hash for r in records]):
+            # qBittorrent priorities: 0 skip, 1 normal, 6 high, 7 maximum (libtorrent's 2-5 count as normal)
+            file_priorities = self._file_priorities(torrent['hash'])
+            ratio_limit = torrent.get('ratio_limit', -2)
+            settings[torrent['hash']] = transfer_settings(
+                wanted=[priority > 0 for priority in file_priorities],
+                priorities=[1 if priority >= 6 else 0 for priority in file_priorities],
+                sequential=bool(torrent.get('seq_dl')),
+                download_limit=torrent.get('dl_limit') or 0,
+                upload_limit=torrent.get('up_limit') or 0,
+                ratio_limit=None if ratio_limit == -2 else (-1 if ratio_limit < 0 else float(ratio_limit))
+            )
+        return settings
+
+    def _file_priorities(self, torrent_hash: str) -> List[int]:
+        """Per-file priorities, from the .fastresume when possible."""
+        fastresume = self.read_fastresume(torrent_hash)
+        if fastresume is not None:
+            # libtorrent leaves file_priority out while every file is at the default
+            return list(fastresume.get(b'file_priority', []))
+
+        files = self.rate.call(self.client.torrents_files, torrent_hash=torrent_hash)
+        return [f['priority'] for f in files]
 
     def export_torrent(self, torrent_hash: str, output_dir: str) -> str:
         """Export .torrent file from qBittorrent."""
+        torrent_data = self.fetch_torrent(torrent_hash)
+        output_path = Path(output_dir) / f"{torrent_hash}.torrent"
+        with open(output_path, 'wb') as f:
+            f.write(torrent_data)
+        return str(output_path)
+
+    def fetch_torrent(self, torrent_hash: str) -> bytes:
+        """Get .torrent file contents, from BT_backup when available, else through the API."""
+        torrent_data = self.read_backup_torrent(torrent_hash)
+        if torrent_data is not None:
+            return torrent_data
+
         if not self.connected:
             raise RuntimeError("Not connected to qBittorrent. Call connect() first.")
 
         try:
-            torrent_data = self.client.torrents_export(torrent_hash=torrent_hash)
-            output_path = Path(output_dir) / f"{torrent_hash}.torrent"
-            with open(output_path, 'wb') as f:
-                f.write(torrent_data)
-            return str(output_path)
+            return self.rate.call(self.client.torrents_export, torrent_hash=torrent_hash)
         except Exception as e:
             print(f"✗ Error exporting torrent {torrent_hash}: {e}")
             raise
 
+    def export_torrents(self, torrent_hashes: List[str]) -> Iterator[Tuple[str, Any]]:
+        """
+        Bulk-export .torrent contents as (hash, data) pairs.
+
+        Hashes found in BT_backup are read first, in directory order, so a
+        bulk export is one sequential pass over the directory; only the misses
+        go through the API. A failed export yields its exception as the data.
+        """
+        names = self._bt_backup_names()
+        on_disk = sorted((h for h in torrent_hashes if f"{h}.torrent" in names), key=lambda h: names[f"{h}.torrent"])
+        on_disk_set = set(on_disk)
+
+        for torrent_hash in on_disk + [h for h in torrent_hashes if h not in on_disk_set]:
+            try:
+                yield torrent_hash, self.fetch_torrent(torrent_hash)
+            except Exception as e:
+                yield torrent_hash, e
+
+    def _bt_backup_names(self) -> Dict[str, int]:
+        """
+        List BT_backup once per run, mapping each name to its position in directory order.
+
+        Per-file existence checks would stat every torrent.
+        """
+        if self._bt_backup_listing is None:
+            bt_backup_dir = self.config.get('bt_backup_dir')
+            try:
+                listing = os.listdir(bt_backup_dir) if bt_backup_dir else []
+            except OSError as e:
+                print(f"  ⚠ Cannot read bt_backup_dir {bt_backup_dir}: {e} - exporting through the API")
+                listing = []
+            self._bt_backup_listing = {name: position for position, name in enumerate(listing)}
+        return self._bt_backup_listing
+
+    def read_fastresume(self, torrent_hash: str) -> Optional[Dict[bytes, Any]]:
+        """Read a torrent's .fastresume from BT_backup, or None if it isn't there."""
+        if f"{torrent_hash}.fastresume" not in self._bt_backup_names():
+            return None
+
+        path = Path(self.config['bt_backup_dir']) / f"{torrent_hash}.fastresume"
+        try:
+            return bdecode(path.read_bytes())
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Unreadable fastresume {path.name}: {e}")
+            return None
+
+    def read_backup_torrent(self, torrent_hash: str) -> Optional[bytes]:
+        """
+        Read a torrent's .torrent from BT_backup, or None if it isn't there.
+
+        qBittorrent 4.4+ keeps trackers and web seeds in the .fastresume
+        rather than the .torrent, so they are merged back in from there.
+        """
+        if f"{torrent_hash}.torrent" not in self._bt_backup_names():
+            return None
+
+        path = Path(self.config['bt_backup_dir']) / f"{torrent_hash}.torrent"
+        try:
+            torrent_data = path.read_bytes()
+            pairs = dict(_raw_top_level(torrent_data))
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Unreadable BT_backup file {path.name}: {e}")
+            return None
+
+        if b'announce' in pairs or b'announce-list' in pairs:
+            return torrent_data
+
+        fastresume = self.read_fastresume(torrent_hash) or {}
+        tiers = [tier for tier in fastresume.get(b'trackers', []) if tier]
+        if tiers:
+            pairs[b'announce'] = bencode(tiers[0][0])
+            pairs[b'announce-list'] = bencode(tiers)
+        if fastresume.get(b'url-list') and b'url-list' not in pairs:
+            pairs[b'url-list'] = bencode(fastresume[b'url-list'])
+
+        # Splice raw values back together so the info dictionary keeps its exact bytes (and hash)
+        return b'd' + b''.join(bencode(key) + pairs[key] for key in sorted(pairs)) + b'e'
+
     def add_torrent(
         self,
         torrent_file: str,
@@ -165,54 +1251,125 @@ class QBittorrentHandler:
         is_complete: bool = True,
         tags: Optional[List[str]] = None,
         category: Optional[str] = None,
-        is_paused: bool = True
+        is_paused: bool = True,
+        transfer: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Add torrent to qBittorrent with metadata preservation."""
         if not self.connected:
             raise RuntimeError("Not connected to qBittorrent. Call connect() first.")
 
         try:
-            if torrent_file == "MAGNET_FILE":
-                # Add as magnet link
-                if hasattr(self, '_current_magnet_file'):
-                    with open(self._current_magnet_file, 'r') as f:
-                        magnet_link = f.read().strip()
-
-                    self.client.torrents_add(
-                        urls=magnet_link,
-                        save_path=save_path,
-                        is_paused=is_paused,
-                        tags=tags or [],
-                        category=category or ""
-                    )
-                    print(f"  ✓ Added magnet link to qBittorrent")
-                else:
-                    raise ValueError("MAGNET_FILE specified but no magnet file available")
+            options = self._transfer_options(transfer)
+
+            if torrent_file.endswith('.magnet'):
+                # Add as magnet link; there is no file list to prioritise until metadata arrives
+                with open(torrent_file, 'r') as f:
+                    magnet_link = f.read().strip()
+
+                self.rate.call(
+                    self.client.torrents_add,
+                    urls=magnet_link,
+                    save_path=save_path,
+                    is_paused=is_paused,
+                    tags=tags or [],
+                    category=category or "",
+                    **options
+                )
             else:
-                # Add as torrent file
+                # Add as torrent file; read up front so a retry re-sends the whole file
                 with open(torrent_file, 'rb') as f:
-                    # CRITICAL: is_skip_checking=True for complete torrents to avoid re-hash
-                    self.client.torrents_add(
-                        torrent_files=f,
-                        save_path=save_path,
-                        is_skip_checking=is_complete,  # Skip hash check for complete torrents
-                        is_paused=is_paused,  # Add paused for safety
-                        tags=tags or [],  # Preserve labels as tags
-                        category=category or ""
-                    )
-                    print(f"  ✓ Added torrent file to qBittorrent")
+                    torrent_data = f.read()
+
+                # torrents/add rejects file priorities alongside uploaded files, so they are set
+                # right after the add, while the torrent is still paused
+                file_priorities = self._qbittorrent_file_priorities(transfer)
+
+                # CRITICAL: is_skip_checking=True for complete torrents to avoid re-hash
+                self.rate.call(
+                    self.client.torrents_add,
+                    torrent_files=torrent_data,
+                    save_path=save_path,
+                    is_skip_checking=is_complete,  # Skip hash check for complete torrents
+                    is_paused=is_paused or bool(file_priorities),  # Add paused for safety
+                    tags=tags or [],  # Preserve labels as tags
+                    category=category or "",
+                    **options
+                )
+
+                if file_priorities:
+                    v1, v2 = torrent_info_hashes(torrent_data)
+                    torrent_hash = (v1 or v2[:20]).hex()
+                    self._set_file_priorities(torrent_hash, file_priorities)
+                    if not is_paused:
+                        self.rate.call(self.client.torrents_resume, torrent_hashes=torrent_hash)
             return True
         except Exception as e:
             print(f"✗ Error adding torrent from {torrent_file}: {e}")
             return False
 
+    @staticmethod
+    def _transfer_options(transfer: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """torrents/add arguments for the non-default transfer settings."""
+        options: Dict[str, Any] = {}
+        if not transfer:
+            return options
+        if transfer['sequential']:
+            options['is_sequential_download'] = True
+        if transfer['download_limit']:
+            options['download_limit'] = transfer['download_limit']
+        if transfer['upload_limit']:
+            options['upload_limit'] = transfer['upload_limit']
+        if transfer['ratio_limit'] is not None:
+            options['ratio_limit'] = transfer['ratio_limit']
+        return options
+
+    @staticmethod
+    def _qbittorrent_file_priorities(transfer: Optional[Dict[str, Any]]) -> List[int]:
+        """Per-file qBittorrent priorities (0 skip, 1 normal, 6 high), or [] when all are normal."""
+        if not transfer or not (transfer['wanted'] or transfer['priorities']):
+            return []
+        wanted = transfer['wanted'] or []
+        priorities = transfer['priorities'] or []
+        return [
+            0 if index < len(wanted) and not wanted[index]
+            else 6 if index < len(priorities) and priorities[index] > 0
+            else 1
+            for index in range(max(len(wanted), len(priorities)))
+        ]
+
+    def _set_file_priorities(self, torrent_hash: str, file_priorities: List[int]):
+        """Apply file priorities to a just-added torrent with one call per distinct priority."""
+        import qbittorrentapi
+
+        groups: Dict[int, List[int]] = {}
+        for index, priority in enumerate(file_priorities):
+            # Newly added torrents start with every file at normal priority
+            if priority != 1:
+                groups.setdefault(priority, []).append(index)
+
+        for priority, file_ids in sorted(groups.items()):
+            for attempt in range(10):
+                try:
+                    self.rate.call(
+                        self.client.torrents_file_priority,
+                        torrent_hash=torrent_hash,
+                        file_ids=file_ids,
+                        priority=priority
+                    )
+                    break
+                except (qbittorrentapi.NotFound404Error, qbittorrentapi.Conflict409Error):
+                    # torrents/add returns before the torrent is registered
+                    if attempt == 9:
+                        raise
+                    time.sleep(0.5)
+
     def pause_torrent(self, torrent_hash: str) -> bool:
         """Pause a torrent."""
         if not self.connected:
             raise RuntimeError("Not connected to qBittorrent. Call connect() first.")
 
         try:
-            self.client.torrents_pause(torrent_hashes=torrent_hash)
+            self.rate.call(self.client.torrents_pause, torrent_hashes=torrent_hash)
             return True
         except Exception as e:
             print(f"✗ Error pausing torrent {torrent_hash}: {e}")
@@ -230,9 +1387,12 @@ class TransmissionHandler:
         self.config = config
         self.client = None
         self.connected = False
+        self.rate = AdaptiveRateController('Transmission', config.get('rate_control', {}), self._is_retryable)
 
     def connect(self) -> bool:
         """Connect to Transmission RPC."""
+        import transmission_rpc
+
         try:
             # CRITICAL: Must include 'path' parameter for Transmission web interface
             self.client = transmission_rpc.Client(
@@ -244,10 +1404,9 @@ class TransmissionHandler:
                 password=self.config.get('password') or None
             )
 
-            # Verify connection by getting session
-            session = self.client.get_session()
-            version = session.version if hasattr(session, 'version') else 'unknown'
-            print(f"✓ Connected to Transmission (version: {version})")
+            # Creating the client already fetched the session (and its X-Transmission-Session-Id),
+            # so a successful constructor is the connection check
+            print("✓ Connected to Transmission")
             self.connected = True
             return True
 
@@ -262,17 +1421,132 @@ class TransmissionHandler:
             print(f"✗ Unexpected error connecting to Transmission: {e}")
             return False
 
-    def get_torrents(self) -> List[Any]:
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Connection errors and timeouts are transient; RPC results like bad arguments are not."""
+        import transmission_rpc
+
+        if isinstance(error, transmission_rpc.error.TransmissionAuthError):
+            return False
+        if isinstance(error, transmission_rpc.error.TransmissionConnectError):
+            return True
+        if isinstance(error, transmission_rpc.error.TransmissionError):
+            # No parsed RPC response means something else answered, e.g. a 503 from a proxy
+            return error.response is None
+        return isinstance(error, (ConnectionError, TimeoutError))
+
+    # Empty id windows grow up to this multiple of page_size to skip gaps left by removed torrents
+    MAX_WINDOW_FACTOR = 64
+    MAX_EMPTY_WINDOWS = 64
+
+    # Only the fields TorrentRecord needs; fetching all fields is many times slower
+    # sequential_download needs Transmission 4.1+; older daemons leave it out of the response
+    TRANSFER_FIELDS = [
+        'wanted', 'priorities', 'downloadLimit', 'downloadLimited', 'uploadLimit', 'uploadLimited',
+        'seedRatioLimit', 'seedRatioMode', 'sequential_download'
+    ]
+
+    RECORD_FIELDS = ['id', 'hashString', 'name', 'downloadDir', 'percentDone', 'totalSize', 'labels']
+
+    def get_torrents(self) -> List[TorrentRecord]:
         """Get all torrents from Transmission."""
+        return list(self.iter_torrents())
+
+    def iter_torrents(self, page_size: int = 500) -> Iterator[TorrentRecord]:
+        """
+        Yield torrents from Transmission one id range at a time.
+
+        Transmission assigns ids sequentially from 1 when the daemon starts, so
+        walking id windows until torrent_count torrents have been seen covers
+        the whole library. Windows that come back empty are widened to skip
+        over gaps left by removed torrents quickly.
+        """
         if not self.connected:
             raise RuntimeError("Not connected to Transmission. Call connect() first.")
 
         try:
-            return self.client.get_torrents()
+            total = self.count_torrents()
+            seen = 0
+            start = 1
+            window = page_size
+            empty_windows = 0
+
+            while seen < total:
+                page = self.rate.call_bulk(
+                    self.client.get_torrents,
+                    ids=list(range(start, start + window)),
+                    arguments=self.RECORD_FIELDS
+                )
+                start += window
+
+                if page:
+                    seen += len(page)
+                    window = page_size
+                    empty_windows = 0
+                    for torrent in page:
+                        yield self._record(torrent)
+                    continue
+
+                empty_windows += 1
+                window = min(window * 2, page_size * self.MAX_WINDOW_FACTOR)
+                if empty_windows >= self.MAX_EMPTY_WINDOWS:
+                    print(f"  ⚠ Stopped scanning Transmission ids at {start} ({seen}/{total} torrents seen)")
+                    return
+                # Torrents removed while scanning would otherwise keep us looking forever
+                total = self.count_torrents()
         except Exception as e:
             print(f"✗ Error getting torrents from Transmission: {e}")
             raise
 
+    @staticmethod
+    def _record(torrent: Any) -> TorrentRecord:
+        """Project a Transmission torrent onto a TorrentRecord."""
+        fields = torrent.fields
+        return TorrentRecord(
+            info_hash=parse_hash(fields['hashString']),
+            name=fields['name'],
+            save_path=fields['downloadDir'],
+            progress=fields['percentDone'],
+            size=fields.get('totalSize', 0),
+            labels=tuple(fields.get('labels') or ()),
+            torrent_id=fields['id']
+        )
+
+    def count_torrents(self) -> int:
+        """Get the number of torrents in Transmission."""
+        if not self.connected:
+            raise RuntimeError("Not connected to Transmission. Call connect() first.")
+
+        return self.rate.call(self.client.session_stats).torrent_count
+
+    def get_transfer_settings(self, records: List[TorrentRecord]) -> Dict[str, Dict[str, Any]]:
+        """Fetch file selection, priorities, sequential mode and limits for a batch of torrents in one call."""
+        if not records:
+            return {}
+        if not self.connected:
+            raise RuntimeError("Not connected to Transmission. Call connect() first.")
+
+        torrents = self.rate.call_bulk(
+            self.client.get_torrents,
+            ids=[r.torrent_id for r in records],
+            arguments=self.TRANSFER_FIELDS
+        )
+
+        settings = {}
+        for torrent in torrents:
+            fields = torrent.fields
+            # Transmission speed limits are in kB/s; seedRatioMode 0 is global, 1 per-torrent, 2 unlimited
+            ratio_mode = fields.get('seedRatioMode', 0)
+            settings[fields['hashString']] = transfer_settings(
+                wanted=[bool(w) for w in fields.get('wanted', [])],
+                priorities=list(fields.get('priorities', [])),
+                sequential=bool(fields.get('sequential_download', False)),
+                download_limit=fields.get('downloadLimit', 0) * 1000 if fields.get('downloadLimited') else 0,
+                upload_limit=fields.get('uploadLimit', 0) * 1000 if fields.get('uploadLimited') else 0,
+                ratio_limit=None if ratio_mode == 0 else (float(fields.get('seedRatioLimit', 0)) if ratio_mode == 1 else -1)
+            )
+        return settings
+
     def get_torrent_file_path(self, torrent_hash: str, torrent_name: str = "") -> str:
         """Get path to .torrent file for a given hash, handling both .torrent and .magnet files."""
         torrent_dir = Path(self.config['torrent_dir']).expanduser().resolve()
@@ -282,13 +1556,10 @@ class TransmissionHandler:
         if torrent_file.exists():
             return str(torrent_file)
 
-        # Check for .magnet file
+        # Check for .magnet file; add_torrent recognises it by its suffix
         magnet_file = torrent_dir / f"{torrent_hash}.magnet"
         if magnet_file.exists():
-            # Store magnet file path for later use in add_torrent
-            self._current_magnet_file = str(magnet_file)
-            self._current_magnet_hash = torrent_hash
-            return "MAGNET_FILE"
+            return str(magnet_file)
 
         raise FileNotFoundError(
             f"Neither torrent nor magnet file found for hash {torrent_hash}\n"
@@ -300,7 +1571,8 @@ class TransmissionHandler:
         torrent_file: str,
         download_dir: str,
         paused: bool = True,
-        labels: Optional[List[str]] = None
+        labels: Optional[List[str]] = None,
+        transfer: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Add torrent to Transmission with metadata preservation."""
         if not self.connected:
@@ -313,34 +1585,60 @@ class TransmissionHandler:
             # Add torrent using base64-encoded data
             torrent_b64 = base64.b64encode(torrent_data).decode('utf-8')
 
-            added_torrent = self.client.add_torrent(
+            # Labels and file selection are set in the same torrent-add call (Transmission 3.0+),
+            # so deselected files are never touched
+            wanted = (transfer or {}).get('wanted') or []
+            priorities = (transfer or {}).get('priorities') or []
+            torrent = self.rate.call(
+                self.client.add_torrent,
                 torrent=torrent_b64,
                 download_dir=download_dir,
-                paused=paused
+                paused=paused,
+                labels=labels or None,
+                files_unwanted=[i for i, w in enumerate(wanted) if not w] or None,
+                priority_high=[i for i, p in enumerate(priorities) if p > 0] or None,
+                priority_low=[i for i, p in enumerate(priorities) if p < 0] or None
             )
 
-            # Add labels if supported (Transmission 3.0+)
-            if labels and hasattr(added_torrent, 'labels'):
-                try:
-                    added_torrent.labels = labels
-                except Exception as e:
-                    print(f"  ⚠ Warning: Could not set labels: {e}")
+            changes = self._transfer_changes(transfer)
+            if changes:
+                self.rate.call(self.client.change_torrent, ids=[torrent.id], **changes)
 
             return True
         except Exception as e:
             print(f"✗ Error adding torrent from {torrent_file}: {e}")
             return False
 
-    def pause_torrent(self, torrent_id: int) -> bool:
-        """Pause a torrent."""
+    @staticmethod
+    def _transfer_changes(transfer: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """torrent-set arguments for the non-default limits and sequential mode."""
+        changes: Dict[str, Any] = {}
+        if not transfer:
+            return changes
+        if transfer['download_limit']:
+            changes.update(download_limit=max(1, round(transfer['download_limit'] / 1000)), download_limited=True)
+        if transfer['upload_limit']:
+            changes.update(upload_limit=max(1, round(transfer['upload_limit'] / 1000)), upload_limited=True)
+        if transfer['ratio_limit'] is not None:
+            if transfer['ratio_limit'] < 0:
+                changes['seed_ratio_mode'] = 2
+            else:
+                changes.update(seed_ratio_mode=1, seed_ratio_limit=transfer['ratio_limit'])
+        if transfer['sequential']:
+            # Passed through as a raw torrent-set argument (Transmission 4.1+, ignored by older daemons)
+            changes['sequential_download'] = True
+        return changes
+
+    def pause_torrent(self, torrent_hash: str) -> bool:
+        """Pause a torrent by info-hash."""
         if not self.connected:
             raise RuntimeError("Not connected to Transmission. Call connect() first.")
 
         try:
-            self.client.stop_torrent(torrent_id)
+            self.rate.call(self.client.stop_torrent, torrent_hash)
             return True
         except Exception as e:
-            print(f"✗ Error pausing torrent {torrent_id}: {e}")
+            print(f"✗ Error pausing torrent {torrent_hash}: {e}")
             return False
 
 
@@ -363,235 +1661,754 @@ class Migrator:
         self.temp_dir = Path(temp_dir)
         self.migration_config = migration_config
         self.temp_dir.mkdir(exist_ok=True)
+        self.path_mapper = PathMapper(migration_config)
+        self.relocator = DataRelocator(migration_config)
+
+        cache_bytes = migration_config.get('torrent_cache_max_bytes', 512 * 1024 * 1024)
+        self.torrent_cache = TorrentCache(self.temp_dir / 'torrent-cache', cache_bytes) if cache_bytes else None
 
     def migrate_transmission_to_qbittorrent(self, dry_run: bool = False) -> Dict[str, Any]:
         """Migrate torrents from Transmission to qBittorrent."""
         print("\n=== Migrating Transmission → qBittorrent ===\n")
+        return self._migrate('tr2qb', dry_run)
 
-        print("Fetching torrents from Transmission...")
-        tr_torrents = self.tr_handler.get_torrents()
-        print(f"Found {len(tr_torrents)} torrents in Transmission\n")
+    def migrate_qbittorrent_to_transmission(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Migrate torrents from qBittorrent to Transmission."""
+        print("\n=== Migrating qBittorrent → Transmission ===\n")
+        return self._migrate('qb2tr', dry_run)
 
+    def _migrate(self, direction: str, dry_run: bool) -> Dict[str, Any]:
+        """Plan and execute in one pass: each action runs as soon as it is decided."""
+        results = {'success': [], 'failed': [], 'skipped': 0, 'total': 0}
+        actions = self.plan_actions(direction, results, fetch_files=not dry_run)
         if dry_run:
             print("DRY RUN MODE - No changes will be made\n")
+        return self.execute(direction, actions, results, dry_run)
+
+    def _endpoints(self, direction: str) -> Tuple[Any, str, Any, str]:
+        """Source handler, source client, destination handler and destination client of a direction."""
+        if direction == 'tr2qb':
+            return self.tr_handler, 'transmission', self.qb_handler, 'qbittorrent'
+        return self.qb_handler, 'qbittorrent', self.tr_handler, 'transmission'
 
-        results = {'success': [], 'failed': [], 'skipped': [], 'total': len(tr_torrents)}
+    def plan_actions(
+        self,
+        direction: str,
+        results: Dict[str, Any],
+        fetch_files: bool = True,
+        records: Optional[List[TorrentRecord]] = None,
+        index: Optional[InfoHashIndex] = None,
+        pin_dir: Optional[Path] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Decide what migrating each new torrent takes, yielding one action per torrent.
+
+        Actions are plain JSON-serialisable dicts so they can be executed
+        straight away or written to a plan file. Skipped and failed torrents
+        are recorded in results. Without fetch_files (dry runs) qBittorrent
+        exports are not fetched and the .torrent path is only a placeholder.
+        records and index let a caller that already listed both clients (the
+        audit) skip listing them again. With pin_dir, every .torrent is copied
+        there as soon as it is fetched, out of reach of cache eviction.
+        """
+        source, source_client, destination, destination_client = self._endpoints(direction)
+        source_name, destination_name = source.rate.name, destination.rate.name
+        page_size = self.migration_config.get('page_size', 500)
+
+        # The destination identity index is the only thing kept for the whole run
+        if index is None:
+            print(f"Indexing torrents in {destination_name}...")
+            index = self._build_index(destination)
+        print(f"Found {len(index)} torrents in {destination_name}")
+
+        if records is None:
+            total = source.count_torrents()
+            source_records = source.iter_torrents(page_size)
+        else:
+            total = len(records)
+            source_records = iter(records)
+        print(f"Found {total if total is not None else 'an unknown number of'} torrents in {source_name}\n")
 
-        # Get existing qBittorrent torrents to avoid duplicates
-        qb_torrents = self.qb_handler.get_torrents()
-        qb_hashes = {t.hash for t in qb_torrents}
+        torrents = self._with_page_prefetch(direction, source_records, index, page_size, fetch_files, pin_dir)
 
-        for idx, torrent in enumerate(tr_torrents, 1):
-            print_progress(idx, len(tr_torrents), torrent.name)
+        for idx, (torrent, torrent_file, transfer) in enumerate(torrents, 1):
+            results['total'] = idx
+            print_progress(idx, total, torrent.name)
 
             try:
-                # Skip if already exists in qBittorrent
-                if torrent.hashString in qb_hashes:
-                    print(f"  ⊘ Already exists in qBittorrent, skipping")
-                    results['skipped'].append({
-                        'name': torrent.name,
-                        'hash': torrent.hashString,
-                        'reason': 'Already exists'
-                    })
+                # Skip if already exists in the destination
+                if torrent in index:
+                    # Counted rather than listed: on repeated syncs nearly every torrent is skipped
+                    print(f"  ⊘ Already exists in {destination_name}, skipping\n")
+                    results['skipped'] += 1
                     continue
 
-                # Pause in Transmission
-                if not dry_run and self.migration_config.get('pause_source', True):
-                    self.tr_handler.pause_torrent(torrent.id)
-                    print(f"  ⏸ Paused in Transmission")
+                if direction == 'tr2qb':
+                    try:
+                        torrent_file = self._transmission_torrent_file(torrent)
+                        if pin_dir:
+                            torrent_file = self._pin_torrent_file(torrent.hash, torrent_file, pin_dir)
+                    except FileNotFoundError as e:
+                        print(f"  ✗ Torrent file not found: {e}\n")
+                        results['failed'].append({'name': torrent.name, 'hash': torrent.hash, 'error': str(e)})
+                        continue
+
+                    # Transmission only reports one hash; the .torrent reveals the v1/v2 pair of hybrids
+                    if self._learn_hashes(torrent, torrent_file) and torrent in index:
+                        print(f"  ⊘ Already exists in {destination_name} under its other info-hash, skipping\n")
+                        results['skipped'] += 1
+                        continue
+
+                # .torrent files were exported in bulk for this page; surface a failed export here
+                elif isinstance(torrent_file, Exception):
+                    raise torrent_file
+                elif torrent_file is None:
+                    torrent_file = f"{self.temp_dir}/{torrent.hash}.torrent"
 
-                # Get .torrent file path
-                try:
-                    torrent_file = self.tr_handler.get_torrent_file_path(torrent.hashString, torrent.name)
-                except FileNotFoundError as e:
-                    print(f"  ✗ Torrent file not found: {e}")
-                    results['failed'].append({
-                        'name': torrent.name,
-                        'hash': torrent.hashString,
-                        'error': str(e)
-                    })
-                    continue
+                if isinstance(transfer, Exception):
+                    raise transfer
 
-                # Determine if torrent is complete
-                is_complete = torrent.percent_done >= 1.0
+                action = self._plan_action(direction, torrent, torrent_file, transfer)
+            except Exception as e:
+                print(f"  ✗ Error: {e}\n")
+                results['failed'].append({'name': torrent.name, 'hash': torrent.hash, 'error': str(e)})
+                continue
 
-                # Map metadata
-                metadata = self._map_transmission_metadata(torrent)
+            yield action
 
-                print(f"  📁 Path: {metadata['save_path']}")
-                print(f"  📊 Complete: {is_complete} ({torrent.percent_done * 100:.1f}%)")
-                if metadata['tags']:
-                    print(f"  🏷  Tags: {', '.join(metadata['tags'])}")
+    def _plan_action(
+        self,
+        direction: str,
+        torrent: TorrentRecord,
+        torrent_file: str,
+        transfer: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the action that migrates one torrent."""
+        _, source_client, _, destination_client = self._endpoints(direction)
+        is_complete = torrent.is_complete
+        # Progress only covers wanted files; pieces shared with skipped files may be missing
+        partial = bool(transfer and transfer['wanted'] and not all(transfer['wanted']))
+
+        if direction == 'tr2qb':
+            metadata = self._map_transmission_metadata(torrent)
+            destination_dir = metadata['save_path']
+            skip_checking = (
+                is_complete and not partial
+                and self.migration_config.get('skip_checking_complete', True)
+            )
+            add = {
+                'torrent_file': torrent_file,
+                'save_path': destination_dir,
+                'is_complete': skip_checking,
+                'tags': metadata['tags'],
+                'category': metadata.get('category'),
+                'is_paused': True,
+                'transfer': transfer
+            }
+            labels = metadata['tags']
+        else:
+            metadata = self._map_qbittorrent_metadata(torrent)
+            destination_dir = metadata['download_dir']
+            # Transmission verifies whatever data is already on disk when a torrent is added
+            skip_checking = False
+            add = {
+                'torrent_file': torrent_file,
+                'download_dir': destination_dir,
+                'paused': True,
+                'labels': metadata['labels'],
+                'transfer': transfer
+            }
+            labels = metadata['labels']
+
+        print(f"  📁 Path: {destination_dir}")
+        print(f"  📊 Complete: {is_complete} ({torrent.progress * 100:.1f}%)")
+        if labels:
+            print(f"  🏷  {'Tags' if direction == 'tr2qb' else 'Labels'}: {', '.join(labels)}")
+        if describe_transfer(transfer):
+            print(f"  🎛  Transfer: {describe_transfer(transfer)}")
+
+        payload, entries = self._payload(torrent, torrent_file, source_client)
+        relocate = self._plan_relocation(
+            payload, entries, torrent.name, torrent_file, torrent.size,
+            destination_dir, destination_client, is_complete
+        )
+        on_disk = int(torrent.size * torrent.progress)
+        # The check reads whatever exists of the skipped files too, so budget for all of it
+        bytes_to_hash = torrent.size if partial and on_disk > 0 else on_disk
+
+        return {
+            'name': torrent.name,
+            'hash': torrent.hash,
+            # Info-hash rather than Transmission's id, which is only valid until the daemon restarts
+            'source_id': torrent.hash,
+            'path': destination_dir,
+            'complete': is_complete,
+            'data_path': str(payload / entries[0] if entries else payload),
+            'pause': bool(self.migration_config.get('pause_source', True)),
+            'relocate': relocate,
+            'add': add,
+            'recheck': not skip_checking and on_disk > 0,
+            'size': torrent.size,
+            'bytes_to_copy': relocate['bytes_to_copy'] if relocate else 0,
+            'bytes_to_hash': 0 if skip_checking else bytes_to_hash
+        }
 
-                # Add to qBittorrent
-                if not dry_run:
-                    success = self.qb_handler.add_torrent(
-                        torrent_file=torrent_file,
-                        save_path=metadata['save_path'],
-                        is_complete=is_complete and self.migration_config.get('skip_checking_complete', True),
-                        tags=metadata['tags'],
-                        category=metadata.get('category'),
-                        is_paused=True
-                    )
+    def execute(
+        self,
+        direction: str,
+        actions: Iterator[Dict[str, Any]],
+        results: Dict[str, Any],
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Carry out planned actions: pause the source, relocate data, then add to the destination."""
+        source, _, destination, _ = self._endpoints(direction)
+        destination_name = destination.rate.name
+
+        pool = ThreadPoolExecutor(max_workers=destination.rate.max_concurrency)
+        pending: Dict[Future, Dict[str, Any]] = {}
+
+        for action in actions:
+            entry = {
+                'name': action['name'],
+                'hash': action['hash'],
+                'path': action['path'],
+                'complete': action['complete']
+            }
+            try:
+                if action['pause'] and not dry_run:
+                    source.pause_torrent(action['source_id'])
+                    print(f"  ⏸ Paused in {source.rate.name}")
 
-                    if success:
-                        print(f"  ✓ Added to qBittorrent")
-                        results['success'].append({
-                            'name': torrent.name,
-                            'hash': torrent.hashString,
-                            'path': metadata['save_path'],
-                            'complete': is_complete
-                        })
-                        time.sleep(self.migration_config.get('rate_limit_sleep', 0.5))
-                    else:
-                        results['failed'].append({
-                            'name': torrent.name,
-                            'hash': torrent.hashString,
-                            'error': 'Failed to add to qBittorrent'
-                        })
+                if action['relocate']:
+                    self._relocate_payload(action['relocate'], dry_run)
+
+                # Adds run concurrently as far as the destination's rate controller allows
+                if not dry_run:
+                    future = pool.submit(destination.add_torrent, **action['add'])
+                    pending[future] = entry
+                    print(f"  ⇢ Queued for {destination_name}")
+                    self._collect_adds(pending, results, destination_name, destination.rate.max_concurrency)
                 else:
-                    print(f"  ✓ Would be added to qBittorrent")
-                    results['success'].append({
-                        'name': torrent.name,
-                        'hash': torrent.hashString,
-                        'path': metadata['save_path'],
-                        'complete': is_complete
-                    })
+                    print(f"  ✓ Would be added to {destination_name}")
+                    results['success'].append(entry)
 
             except Exception as e:
                 print(f"  ✗ Error: {e}")
                 results['failed'].append({
-                    'name': torrent.name,
-                    'hash': torrent.hashString,
+                    'name': action['name'],
+                    'hash': action['hash'],
                     'error': str(e)
                 })
 
             print()
 
+        self._collect_adds(pending, results, destination_name, 0)
+        pool.shutdown()
+
         return results
 
-    def migrate_qbittorrent_to_transmission(self, dry_run: bool = False) -> Dict[str, Any]:
-        """Migrate torrents from qBittorrent to Transmission."""
-        print("\n=== Migrating qBittorrent → Transmission ===\n")
+    def write_plan(self, direction: str, plan_path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Plan a migration into a JSON Lines file without changing either client.
+
+        The file holds a header, one action per torrent and a closing summary
+        with byte counts and a duration estimate built from the measured
+        single-call API latency of both clients and the read throughput of
+        the source data.
+        .torrent files are fetched now and copied to a <plan>.torrents
+        directory beside the plan, so apply only has to execute and does not
+        depend on what the cache still holds by then.
+        """
+        source, _, destination, _ = self._endpoints(direction)
+        plan_dir = Path(plan_path).parent
+        pin_dir = self.plan_torrent_dir(plan_path)
+        shutil.rmtree(pin_dir, ignore_errors=True)
+        pin_dir.mkdir(parents=True)
+        results = {'success': [], 'failed': [], 'skipped': 0, 'total': 0}
+        totals = {'torrents': 0, 'pause': 0, 'relocate': 0, 'recheck': 0, 'bytes_to_copy': 0, 'bytes_to_hash': 0}
+
+        throughput = self.migration_config.get('disk_throughput')
+        throughput_source = 'configured' if throughput else None
+
+        with open(plan_path, 'w') as f:
+            header = {'type': 'header', 'version': PLAN_VERSION, 'direction': direction, 'created': time.time()}
+            f.write(json.dumps(header) + '\n')
+
+            for action in self.plan_actions(direction, results, pin_dir=pin_dir):
+                # Sample the first complete payload that is visible from here
+                if throughput_source is None and action['complete']:
+                    throughput = measure_read_throughput(Path(action['data_path']))
+                    throughput_source = 'measured' if throughput else 'assumed'
+
+                # Relative to the plan file, so the plan and its .torrents move together
+                action['add']['torrent_file'] = os.path.relpath(action['add']['torrent_file'], plan_dir)
+                f.write(json.dumps(dict(action, type='torrent')) + '\n')
+
+                totals['torrents'] += 1
+                totals['pause'] += action['pause']
+                totals['relocate'] += action['relocate'] is not None
+                totals['recheck'] += action['recheck']
+                totals['bytes_to_copy'] += action['bytes_to_copy']
+                totals['bytes_to_hash'] += action['bytes_to_hash']
+
+                steps = [step for step in ('pause', 'relocate') if action[step]] + ['add']
+                if action['recheck']:
+                    steps.append('recheck')
+                print(f"  📝 Planned: {', '.join(steps)}\n")
+
+            if not throughput:
+                throughput, throughput_source = 100 * 1024 * 1024, 'assumed'
+
+            # Pauses and adds are single calls; listing pages say nothing about how long those take,
+            # so time one cheap call on a client that has made none yet
+            for handler in (source, destination):
+                if handler.rate.call_latency is None:
+                    try:
+                        handler.count_torrents()
+                    except Exception as e:
+                        print(f"⚠ Could not time a {handler.rate.name} call for the estimate: {e}")
+            # Adds are counted as sequential calls, so the API share is an upper bound
+            api_seconds = (
+                totals['pause'] * ((source.rate.call_latency or 0.0) + source.rate.delay)
+                + totals['torrents'] * ((destination.rate.call_latency or 0.0) + destination.rate.delay)
+            )
+            summary = dict(
+                totals,
+                type='summary',
+                skipped=results['skipped'],
+                failed=len(results['failed']),
+                disk_throughput=throughput,
+                disk_throughput_source=throughput_source,
+                api_seconds=api_seconds,
+                copy_seconds=totals['bytes_to_copy'] / throughput,
+                hash_seconds=totals['bytes_to_hash'] / throughput
+            )
+            summary['estimated_seconds'] = summary['api_seconds'] + summary['copy_seconds'] + summary['hash_seconds']
+            f.write(json.dumps(summary) + '\n')
+
+        return results, summary
+
+    @staticmethod
+    def plan_torrent_dir(plan_path: str) -> Path:
+        """Directory holding the .torrent files a plan refers to."""
+        return Path(plan_path).with_suffix('.torrents')
+
+    def apply_plan(self, plan_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Execute a plan file written by write_plan; returns its direction and the results."""
+        plan_dir = Path(plan_path).parent
+        with open(plan_path) as f:
+            header = json.loads(f.readline() or '{}')
+            if header.get('type') != 'header' or header.get('version') != PLAN_VERSION:
+                raise ValueError(f"{plan_path} is not a version {PLAN_VERSION} migration plan")
+
+            # An interrupted plan run leaves no summary; refuse to apply half a decision.
+            # Check every .torrent is still there too, before anything is paused.
+            summary: Dict[str, Any] = {}
+            missing = []
+            for line in f:
+                summary = json.loads(line)
+                if summary.get('type') == 'torrent' and not (plan_dir / summary['add']['torrent_file']).exists():
+                    missing.append(summary['add']['torrent_file'])
+            if summary.get('type') != 'summary':
+                raise ValueError(f"{plan_path} is incomplete (no summary line)")
+            if missing:
+                raise ValueError(
+                    f"{plan_path} refers to {len(missing)} missing .torrent files "
+                    f"(first: {missing[0]}); keep {self.plan_torrent_dir(plan_path).name} next to the plan"
+                )
+
+            direction = header['direction']
+            source, _, destination, _ = self._endpoints(direction)
+            age = time.time() - header['created']
+            print(f"\n=== Applying plan: {source.rate.name} → {destination.rate.name} ===\n")
+            print(f"{summary['torrents']} torrents, planned {format_duration(age)} ago, "
+                  f"estimated {format_duration(summary['estimated_seconds'])}\n")
+
+            results = {'success': [], 'failed': [], 'skipped': 0, 'total': 0}
+
+            def actions() -> Iterator[Dict[str, Any]]:
+                f.seek(0)
+                f.readline()
+                idx = 0
+                for line in f:
+                    action = json.loads(line)
+                    if action['type'] != 'torrent':
+                        continue
+                    action['add']['torrent_file'] = str(plan_dir / action['add']['torrent_file'])
+                    idx += 1
+                    results['total'] = idx
+                    print_progress(idx, summary['torrents'], action['name'])
+                    yield action
+
+            return direction, self.execute(direction, actions(), results)
+
+    def format_plan_summary(self, summary: Dict[str, Any]) -> str:
+        """Describe a plan's summary for the console."""
+        report = f"\n{'='*60}\n"
+        report += "Migration Plan\n"
+        report += f"{'='*60}\n\n"
+        report += f"To add: {summary['torrents']} (⊘ {summary['skipped']} already exist, ✗ {summary['failed']} failed)\n"
+        report += f"To pause in source: {summary['pause']}\n"
+        report += f"To relocate: {summary['relocate']} ({format_bytes(summary['bytes_to_copy'])} to copy)\n"
+        report += f"To recheck: {summary['recheck']} ({format_bytes(summary['bytes_to_hash'])} to hash)\n\n"
+        report += (
+            f"Disk throughput: {format_bytes(summary['disk_throughput'])}/s ({summary['disk_throughput_source']})\n"
+            f"Estimated duration: {format_duration(summary['estimated_seconds'])} "
+            f"(API {format_duration(summary['api_seconds'])}, copy {format_duration(summary['copy_seconds'])}, "
+            f"hash {format_duration(summary['hash_seconds'])})\n"
+        )
+        report += f"{'='*60}\n"
+        return report
+
+    def audit(self) -> Tuple[Dict[str, Any], Dict[str, Tuple[List[TorrentRecord], InfoHashIndex]]]:
+        """
+        Compare both clients in one pass and categorise how they have drifted apart.
 
-        print("Fetching torrents from qBittorrent...")
-        qb_torrents = self.qb_handler.get_torrents()
-        print(f"Found {len(qb_torrents)} torrents in qBittorrent\n")
+        Both clients are listed once, at the same time. Their records are
+        sorted by canonical info-hash and merge-joined, so the diff is linear
+        after the sort. Returns the JSON-ready report and, per direction, the
+        torrents missing at the destination with the destination's identity
+        index, ready for migrate_drift.
+        """
+        page_size = self.migration_config.get('page_size', 500)
+
+        print("Listing torrents in both clients...")
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            tr_future = pool.submit(lambda: list(self.tr_handler.iter_torrents(page_size)))
+            qb_future = pool.submit(lambda: list(self.qb_handler.iter_torrents(page_size)))
+            tr_records, qb_records = tr_future.result(), qb_future.result()
+        listed = time.monotonic()
+        print(f"Found {len(tr_records)} torrents in Transmission and {len(qb_records)} in qBittorrent\n")
+
+        tr_index, qb_index = InfoHashIndex(), InfoHashIndex()
+        for record in tr_records:
+            tr_index.add(record)
+        for record in qb_records:
+            qb_index.add(record)
+
+        tr_records.sort(key=lambda record: record.canonical_hash)
+        qb_records.sort(key=lambda record: record.canonical_hash)
+
+        drift: Dict[str, List[Dict[str, Any]]] = {category: [] for category in AUDIT_CATEGORIES}
+        missing: Dict[str, List[TorrentRecord]] = {'tr2qb': [], 'qb2tr': []}
+        in_sync = 0
+        i = j = 0
+        while i < len(tr_records) or j < len(qb_records):
+            tr = tr_records[i] if i < len(tr_records) else None
+            qb = qb_records[j] if j < len(qb_records) else None
+
+            if qb is None or (tr is not None and tr.canonical_hash < qb.canonical_hash):
+                i += 1
+                # A hybrid may still be known to the other side under its second hash
+                if tr not in qb_index:
+                    drift['missing_in_qbittorrent'].append(self._audit_entry(tr, None))
+                    missing['tr2qb'].append(tr)
+            elif tr is None or qb.canonical_hash < tr.canonical_hash:
+                j += 1
+                if qb not in tr_index:
+                    drift['missing_in_transmission'].append(self._audit_entry(None, qb))
+                    missing['qb2tr'].append(qb)
+            else:
+                i += 1
+                j += 1
+                entry = self._audit_entry(tr, qb)
+                mapped_path = self.path_mapper.translate(tr.save_path, 'transmission', 'qbittorrent')
+                drifted = False
+                if mapped_path.rstrip('/') != qb.save_path.rstrip('/'):
+                    drift['save_path'].append(entry)
+                    drifted = True
+                if sorted(tr.labels) != sorted(qb.labels):
+                    drift['labels'].append(entry)
+                    drifted = True
+                if tr.is_complete != qb.is_complete:
+                    drift['completion'].append(entry)
+                    drifted = True
+                in_sync += not drifted
+
+        report = {
+            'generated': time.time(),
+            'transmission': len(tr_records),
+            'qbittorrent': len(qb_records),
+            'in_sync': in_sync,
+            'counts': {category: len(entries) for category, entries in drift.items()},
+            'listing_seconds': listed - start,
+            'diff_seconds': time.monotonic() - listed,
+            'drift': drift
+        }
+        return report, {'tr2qb': (missing['tr2qb'], qb_index), 'qb2tr': (missing['qb2tr'], tr_index)}
+
+    @staticmethod
+    def _audit_entry(tr: Optional[TorrentRecord], qb: Optional[TorrentRecord]) -> Dict[str, Any]:
+        """One drift report line: the torrent as each client sees it."""
+        def side(record: Optional[TorrentRecord]) -> Optional[Dict[str, Any]]:
+            if record is None:
+                return None
+            return {'save_path': record.save_path, 'labels': list(record.labels), 'progress': round(record.progress, 4)}
+
+        record = tr or qb
+        return {'hash': record.hash, 'name': record.name, 'transmission': side(tr), 'qbittorrent': side(qb)}
 
+    def migrate_drift(
+        self,
+        followup: Dict[str, Tuple[List[TorrentRecord], InfoHashIndex]],
+        direction: str,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Migrate the torrents an audit found missing, reusing its listings instead of listing again."""
+        source, _, destination, _ = self._endpoints(direction)
+        print(f"\n=== Migrating audit findings: {source.rate.name} → {destination.rate.name} ===\n")
+
+        records, index = followup[direction]
+        results = {'success': [], 'failed': [], 'skipped': 0, 'total': 0}
+        actions = self.plan_actions(direction, results, fetch_files=not dry_run, records=records, index=index)
         if dry_run:
             print("DRY RUN MODE - No changes will be made\n")
+        return self.execute(direction, actions, results, dry_run)
+
+    def format_audit_summary(self, report: Dict[str, Any]) -> str:
+        """Describe an audit report for the console."""
+        counts = report['counts']
+        summary = f"\n{'='*60}\n"
+        summary += "Drift Audit\n"
+        summary += f"{'='*60}\n\n"
+        summary += f"Transmission: {report['transmission']} torrents, qBittorrent: {report['qbittorrent']} torrents\n"
+        summary += f"✓ In sync: {report['in_sync']}\n"
+        summary += f"✗ Missing in qBittorrent: {counts['missing_in_qbittorrent']}\n"
+        summary += f"✗ Missing in Transmission: {counts['missing_in_transmission']}\n"
+        summary += f"⚠ Different save path: {counts['save_path']}\n"
+        summary += f"⚠ Different labels/tags: {counts['labels']}\n"
+        summary += f"⚠ Complete on one side only: {counts['completion']}\n\n"
+        summary += f"Listed in {report['listing_seconds']:.1f}s, diffed in {report['diff_seconds']:.2f}s\n"
+        summary += f"{'='*60}\n"
+        return summary
+
+    def _build_index(self, handler: Any) -> InfoHashIndex:
+        """Index every torrent of one client by all of its info-hash identities."""
+        index = InfoHashIndex()
+        for record in handler.iter_torrents(self.migration_config.get('page_size', 500)):
+            index.add(record)
+        return index
+
+    def _transmission_torrent_file(self, torrent: TorrentRecord) -> str:
+        """Get a .torrent (or .magnet) for a Transmission torrent, filling the cache from torrent_dir."""
+        if self.torrent_cache:
+            cached = self.torrent_cache.get(torrent)
+            if cached:
+                return cached
+
+        torrent_file = self.tr_handler.get_torrent_file_path(torrent.hash, torrent.name)
+        if self.torrent_cache and torrent_file.endswith('.torrent'):
+            with open(torrent_file, 'rb') as f:
+                return self.torrent_cache.put(f.read())
+        return torrent_file
 
-        results = {'success': [], 'failed': [], 'skipped': [], 'total': len(qb_torrents)}
-
-        # Get existing Transmission torrents to avoid duplicates
-        tr_torrents = self.tr_handler.get_torrents()
-        tr_hashes = {t.hashString for t in tr_torrents}
+    def _with_page_prefetch(
+        self,
+        direction: str,
+        torrents: Iterator[TorrentRecord],
+        index: InfoHashIndex,
+        page_size: int,
+        fetch_files: bool,
+        pin_dir: Optional[Path] = None
+    ) -> Iterator[Tuple[TorrentRecord, Any, Any]]:
+        """
+        Pair each source torrent with its qBittorrent .torrent path and transfer settings.
+
+        Works a page at a time so that everything about the torrents missing
+        from the destination is fetched in bulk: one call for the page's file
+        selection, priorities and limits, and one sequential pass over
+        BT_backup (or the cache) for qBittorrent exports. Torrents that need
+        nothing get None; a failed fetch gets its exception. Files are pinned
+        to pin_dir one by one, before the next cache insert can evict them.
+        """
+        source = self._endpoints(direction)[0]
 
-        for idx, torrent in enumerate(qb_torrents, 1):
-            print_progress(idx, len(qb_torrents), torrent.name)
+        for batch in _batched(torrents, page_size):
+            new = [torrent for torrent in batch if torrent not in index]
 
             try:
-                # Skip if already exists in Transmission
-                if torrent.hash in tr_hashes:
-                    print(f"  ⊘ Already exists in Transmission, skipping")
-                    results['skipped'].append({
-                        'name': torrent.name,
-                        'hash': torrent.hash,
-                        'reason': 'Already exists'
-                    })
-                    continue
-
-                # Pause in qBittorrent
-                if not dry_run and self.migration_config.get('pause_source', True):
-                    self.qb_handler.pause_torrent(torrent.hash)
-                    print(f"  ⏸ Paused in qBittorrent")
+                settings: Dict[str, Any] = source.get_transfer_settings(new)
+            except Exception as e:
+                settings = {torrent.hash: e for torrent in new}
 
-                # Export .torrent file from qBittorrent
-                if not dry_run:
-                    torrent_file = self.qb_handler.export_torrent(torrent.hash, str(self.temp_dir))
+            files: Dict[str, Any] = {}
+            misses = []
+            for torrent in new:
+                if direction != 'qb2tr' or not fetch_files:
+                    continue
+                cached = self.torrent_cache.get(torrent) if self.torrent_cache else None
+                if cached:
+                    files[torrent.hash] = self._pin_torrent_file(torrent.hash, cached, pin_dir) if pin_dir else cached
                 else:
-                    torrent_file = f"{self.temp_dir}/{torrent.hash}.torrent"
-
-                # Map metadata
-                metadata = self._map_qbittorrent_metadata(torrent)
-                is_complete = torrent.progress >= 1.0
+                    misses.append(torrent.hash)
+
+            for torrent_hash, torrent_data in self.qb_handler.export_torrents(misses):
+                if isinstance(torrent_data, Exception):
+                    files[torrent_hash] = torrent_data
+                elif self.torrent_cache:
+                    cached = self.torrent_cache.put(torrent_data)
+                    files[torrent_hash] = self._pin_torrent_file(torrent_hash, cached, pin_dir) if pin_dir else cached
+                else:
+                    output_path = (pin_dir or self.temp_dir) / f"{torrent_hash}.torrent"
+                    output_path.write_bytes(torrent_data)
+                    files[torrent_hash] = str(output_path)
+
+            for torrent in batch:
+                yield torrent, files.get(torrent.hash), settings.get(torrent.hash)
+
+    @staticmethod
+    def _pin_torrent_file(torrent_hash: str, torrent_file: str, pin_dir: Path) -> str:
+        """Copy a .torrent (or .magnet) into pin_dir, where the cache cannot evict it."""
+        pinned = pin_dir / f"{torrent_hash}{Path(torrent_file).suffix}"
+        shutil.copyfile(torrent_file, pinned)
+        return str(pinned)
+
+    @staticmethod
+    def _learn_hashes(torrent: TorrentRecord, torrent_file: str) -> bool:
+        """Fill in v1/v2 hashes from .torrent metadata; True if anything new was learned."""
+        if not torrent_file.endswith('.torrent'):
+            return False
 
-                print(f"  📁 Path: {metadata['download_dir']}")
-                print(f"  📊 Complete: {is_complete} ({torrent.progress * 100:.1f}%)")
-                if metadata['labels']:
-                    print(f"  🏷  Labels: {', '.join(metadata['labels'])}")
+        with open(torrent_file, 'rb') as f:
+            v1, v2 = torrent_info_hashes(f.read())
 
-                # Add to Transmission
-                if not dry_run:
-                    success = self.tr_handler.add_torrent(
-                        torrent_file=torrent_file,
-                        download_dir=metadata['download_dir'],
-                        paused=True,
-                        labels=metadata['labels']
-                    )
+        learned = False
+        if v1 and torrent.info_hash_v1 is None:
+            torrent.info_hash_v1 = torrent.info_hash if v1 == torrent.info_hash else v1
+            learned = v1 != torrent.info_hash
+        if v2 and torrent.info_hash_v2 is None:
+            torrent.info_hash_v2 = v2
+            learned = True
+        return learned
 
-                    if success:
-                        print(f"  ✓ Added to Transmission")
-                        results['success'].append({
-                            'name': torrent.name,
-                            'hash': torrent.hash,
-                            'path': metadata['download_dir'],
-                            'complete': is_complete
-                        })
-                        time.sleep(self.migration_config.get('rate_limit_sleep', 0.5))
-                    else:
-                        results['failed'].append({
-                            'name': torrent.name,
-                            'hash': torrent.hash,
-                            'error': 'Failed to add to Transmission'
-                        })
+    def _collect_adds(
+        self,
+        pending: Dict[Future, Dict[str, Any]],
+        results: Dict[str, Any],
+        destination: str,
+        max_pending: int
+    ):
+        """Record finished adds until at most max_pending are still outstanding."""
+        while len(pending) > max_pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry = pending.pop(future)
+                if future.result():
+                    print(f"  ✓ Added to {destination}: {entry['name']}")
+                    results['success'].append(entry)
                 else:
-                    print(f"  ✓ Would be added to Transmission")
-                    results['success'].append({
-                        'name': torrent.name,
-                        'hash': torrent.hash,
-                        'path': metadata['download_dir'],
-                        'complete': is_complete
+                    results['failed'].append({
+                        'name': entry['name'],
+                        'hash': entry['hash'],
+                        'error': f'Failed to add to {destination}'
                     })
 
-            except Exception as e:
-                print(f"  ✗ Error: {e}")
-                results['failed'].append({
-                    'name': torrent.name,
-                    'hash': torrent.hash,
-                    'error': str(e)
-                })
-
-            print()
-
-        return results
-
-    def _map_transmission_metadata(self, torrent: Any) -> Dict[str, Any]:
+    def _map_transmission_metadata(self, torrent: TorrentRecord) -> Dict[str, Any]:
         """Map Transmission torrent metadata to qBittorrent format."""
-        metadata = {
-            'save_path': torrent.download_dir,
-            'tags': [],
+        return {
+            'save_path': self.path_mapper.translate(torrent.save_path, 'transmission', 'qbittorrent'),
+            'tags': list(torrent.labels),  # Convert labels to tags
             'category': None
         }
 
-        # Convert labels to tags
-        if hasattr(torrent, 'labels') and torrent.labels:
-            metadata['tags'] = list(torrent.labels)
+    def _map_qbittorrent_metadata(self, torrent: TorrentRecord) -> Dict[str, Any]:
+        """Map qBittorrent torrent metadata to Transmission format."""
+        return {
+            'download_dir': self.path_mapper.translate(torrent.save_path, 'qbittorrent', 'transmission'),
+            'labels': list(torrent.labels)  # Convert tags to labels
+        }
 
-        return metadata
+    def _payload(self, torrent: TorrentRecord, torrent_file: str, client: str) -> Tuple[Path, List[str]]:
+        """
+        Locate a torrent's payload as this script sees it.
 
-    def _map_qbittorrent_metadata(self, torrent: Any) -> Dict[str, Any]:
-        """Map qBittorrent torrent metadata to Transmission format."""
-        metadata = {
-            'download_dir': torrent.save_path,
-            'labels': []
+        Returns the payload path and, when the payload has no root folder of
+        its own (qBittorrent's NoSubfolder layout, where content_path is the
+        save path itself), the top-level entries that make it up.
+        """
+        if not torrent.content_path:
+            return self.path_mapper.local_path(torrent.save_path, client) / torrent.name, []
+
+        # content_path follows renamed root folders, unlike save_path/name
+        payload = self.path_mapper.local_path(torrent.content_path, client)
+        if payload != self.path_mapper.local_path(torrent.save_path, client):
+            return payload, []
+        with open(torrent_file, 'rb') as f:
+            _, entries = torrent_layout(f.read())
+        return payload, entries
+
+    def _plan_relocation(
+        self,
+        src: Path,
+        entries: List[str],
+        name: str,
+        torrent_file: str,
+        size: int,
+        destination_dir: str,
+        destination: str,
+        is_complete: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Decide whether the payload must be relocated, and how many bytes that would copy."""
+        if not self.migration_config.get('relocate_data', False):
+            return None
+
+        # The destination client looks for the payload under the name in the .torrent, which a
+        # renamed root folder no longer matches; magnet links have only the client's name to go on
+        if not torrent_file.endswith('.magnet'):
+            with open(torrent_file, 'rb') as f:
+                name, _ = torrent_layout(f.read())
+        dst = self.path_mapper.local_path(destination_dir, destination) / name
+
+        # Both clients see the same storage - the path rewrite alone is enough
+        if not entries and src.resolve() == dst.resolve():
+            return None
+
+        if not (any((src / entry).exists() for entry in entries) if entries else src.exists()):
+            if is_complete:
+                raise FileNotFoundError(f"Data for complete torrent not found at {src}")
+            print(f"  ⚠ No data at {src} yet, nothing to relocate")
+            return None
+
+        # Reflinks and hardlinks stay within one filesystem; anything else is a full copy
+        existing = dst
+        while not existing.exists() and existing != existing.parent:
+            existing = existing.parent
+        linkable = set(self.relocator.strategies) & {'reflink', 'hardlink'}
+        same_device = src.stat().st_dev == existing.stat().st_dev
+
+        relocation = {
+            'source': str(src),
+            'destination': str(dst),
+            'bytes_to_copy': 0 if linkable and same_device else size
         }
+        if entries:
+            # Move only this torrent's entries, not everything else in the save path
+            relocation['entries'] = entries
+        return relocation
 
-        # Convert tags to labels
-        if hasattr(torrent, 'tags') and torrent.tags:
-            metadata['labels'] = list(torrent.tags.split(',')) if isinstance(torrent.tags, str) else list(torrent.tags)
+    def _relocate_payload(self, relocation: Dict[str, Any], dry_run: bool):
+        """Make the payload available at the destination path, as decided by _plan_relocation."""
+        src, dst = Path(relocation['source']), Path(relocation['destination'])
+        entries = relocation.get('entries')
 
-        return metadata
+        if dry_run:
+            print(f"  🚚 Would relocate {src}{f' ({len(entries)} entries)' if entries else ''} → {dst}")
+            return
+
+        if entries:
+            stats = dict.fromkeys(('files', 'bytes', 'existing', 'reflink', 'hardlink', 'copy'), 0)
+            for entry in entries:
+                if (src / entry).exists():
+                    for key, value in self.relocator.relocate(src / entry, dst / entry).items():
+                        stats[key] += value
+        else:
+            stats = self.relocator.relocate(src, dst)
+        print(
+            f"  🚚 Relocated {stats['files']} files ({format_bytes(stats['bytes'])}): "
+            f"{stats['reflink']} reflinked, {stats['hardlink']} hardlinked, "
+            f"{stats['copy']} copied, {stats['existing']} already present"
+        )
 
     def generate_report(self, results: Dict[str, Any], direction: str) -> str:
         """Generate migration summary report."""
@@ -603,7 +2420,7 @@ class Migrator:
 
         report += f"Total torrents: {results['total']}\n"
         report += f"✓ Successfully migrated: {len(results['success'])}\n"
-        report += f"⊘ Skipped (already exist): {len(results['skipped'])}\n"
+        report += f"⊘ Skipped (already exist): {results['skipped']}\n"
         report += f"✗ Failed: {len(results['failed'])}\n\n"
 
         if results['failed']:
@@ -613,6 +2430,22 @@ class Migrator:
                 report += f"    Error: {item['error']}\n"
             report += "\n"
 
+        for handler in (self.qb_handler, self.tr_handler):
+            rate = handler.rate
+            if rate.stats['calls']:
+                report += (
+                    f"{rate.name} API: {rate.stats['calls']} calls, "
+                    f"{rate.mean_latency * 1000:.0f}ms avg, {rate.stats['retries']} retries, "
+                    f"ended at concurrency {int(rate.limit)} / {rate.delay:.2f}s delay\n"
+                )
+        if self.torrent_cache and any(self.torrent_cache.stats.values()):
+            cache = self.torrent_cache.stats
+            report += (
+                f"Torrent cache: {cache['hits']} hits, {cache['misses']} misses, "
+                f"{cache['stored']} stored, {cache['evicted']} evicted\n"
+            )
+        report += "\n"
+
         if results['success']:
             report += f"Migration completed successfully for {len(results['success'])} torrents.\n"
         else:
@@ -648,16 +2481,39 @@ Examples:
 
   # Use custom config file
   %(prog)s -c /path/to/config.json -d tr2qb
+
+  # Plan a cutover, review the estimate, then execute exactly that plan
+  %(prog)s plan -d tr2qb -o plan.jsonl
+  %(prog)s apply plan.jsonl
+
+  # Report drift between the clients, then migrate whatever is missing on either side
+  %(prog)s audit -o drift.json
+  %(prog)s audit --migrate
         """
     )
 
+    parser.add_argument('command', nargs='?', choices=['migrate', 'plan', 'apply', 'audit'], default='migrate',
+                        help='migrate (default), write a plan, apply a plan, or audit drift between the clients')
+    parser.add_argument('plan', nargs='?', help='Plan file to execute (apply only)')
     parser.add_argument('-c', '--config', default='config.json', help='Path to configuration file (default: config.json)')
-    parser.add_argument('-d', '--direction', choices=['tr2qb', 'qb2tr'], required=True, help='Sync direction')
+    parser.add_argument('-d', '--direction', choices=['tr2qb', 'qb2tr'],
+                        help='Sync direction (migrate and plan; limits audit --migrate to one direction)')
+    parser.add_argument('-o', '--output',
+                        help='File to write: plan (default: migration-plan.jsonl) or audit report (default: drift-report.json)')
+    parser.add_argument('--migrate', action='store_true', help='After an audit, migrate the torrents missing on each side')
     parser.add_argument('-n', '--dry-run', action='store_true', help='Preview sync without making changes')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     parser.add_argument('-t', '--temp-dir', default='.migration-state', help='Temporary directory for .torrent files')
 
     args = parser.parse_args()
+    if args.command == 'apply' and not args.plan:
+        parser.error('apply needs a plan file')
+    if args.command in ('migrate', 'plan') and not args.direction:
+        parser.error('-d/--direction is required')
+    if args.migrate and args.command != 'audit':
+        parser.error('--migrate only applies to audit')
+    if not args.output:
+        args.output = 'drift-report.json' if args.command == 'audit' else 'migration-plan.jsonl'
 
     # Print header
     print("=" * 60)
@@ -684,17 +2540,21 @@ Examples:
     print("=" * 60)
     print()
 
-    qb_handler = QBittorrentHandler(config['qbittorrent'])
+    qb_handler = QBittorrentHandler(config['qbittorrent'], state_dir=temp_dir)
     tr_handler = TransmissionHandler(config['transmission'])
 
-    # Test connections
-    print("Testing qBittorrent connection...")
-    if not qb_handler.connect():
+    # Test connections; both clients are connected at the same time
+    print("Testing qBittorrent and Transmission connections...")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        qb_connect = pool.submit(qb_handler.connect)
+        tr_connect = pool.submit(tr_handler.connect)
+        qb_connected, tr_connected = qb_connect.result(), tr_connect.result()
+
+    if not qb_connected:
         print("\n✗ Failed to connect to qBittorrent")
         return 1
 
-    print("\nTesting Transmission connection...")
-    if not tr_handler.connect():
+    if not tr_connected:
         print("\n✗ Failed to connect to Transmission")
         return 1
 
@@ -710,14 +2570,44 @@ Examples:
 
     # Execute migration
     print("\n" + "=" * 60)
-    if args.dry_run:
+    if args.command == 'plan':
+        print("Planning Migration - No changes will be made")
+    elif args.command == 'audit':
+        print("Auditing Drift Between Clients")
+    elif args.dry_run:
         print("DRY RUN MODE - Preview Only")
     else:
         print("Migration Starting")
     print("=" * 60)
 
     try:
-        if args.direction == 'tr2qb':
+        if args.command == 'plan':
+            results, summary = migrator.write_plan(args.direction, args.output)
+            print(migrator.format_plan_summary(summary))
+            print(f"✓ Plan written to {args.output} - run '{parser.prog} apply {args.output}' to execute it")
+            return 1 if results['failed'] else 0
+
+        if args.command == 'audit':
+            report, followup = migrator.audit()
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(migrator.format_audit_summary(report))
+            print(f"✓ Drift report written to {args.output}")
+            if not args.migrate:
+                return 0
+
+            failed = False
+            for direction in ([args.direction] if args.direction else ['tr2qb', 'qb2tr']):
+                if not followup[direction][0]:
+                    continue
+                results = migrator.migrate_drift(followup, direction, dry_run=args.dry_run)
+                print(migrator.generate_report(results, direction))
+                failed = failed or bool(results['failed'])
+            return 1 if failed else 0
+
+        if args.command == 'apply':
+            args.direction, results = migrator.apply_plan(args.plan)
+        elif args.direction == 'tr2qb':
             results = migrator.migrate_transmission_to_qbittorrent(dry_run=args.dry_run)
         else:
             results = migrator.migrate_qbittorrent_to_transmission(dry_run=args.dry_run)